@@ -601,8 +601,8 @@ class GameIframeExtractor:
             return []
 
     def get_existing_game_urls(self, existing_games):
-        """Get set of existing game URLs for deduplication"""
-        return set(game.get('url', '') for game in existing_games)
+        """Get frozen set of existing game URLs for deduplication"""
+        return frozenset(game.get('url', '') for game in existing_games)
 
     def save_game_data(self, filename='games_data.json'):
         """Save the extracted game data to a JSON file, merging with existing data"""
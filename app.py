@@ -1,9 +1,14 @@
-from flask import Flask
+from flask import Flask, g, request, has_request_context
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_cors import CORS
 from flask_marshmallow import Marshmallow
+from flask_caching import Cache
+from sqlalchemy import event
+from contextlib import contextmanager
 import os
+import orjson
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -13,19 +18,93 @@ load_dotenv()
 db = SQLAlchemy()
 migrate = Migrate()
 ma = Marshmallow()
+cache = Cache()
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Serve jsonify() responses through orjson; types it can't handle fall back to Flask's encoder"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=DefaultJSONProvider.default).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=DefaultJSONProvider.default),
+            mimetype=self.mimetype
+        )
+
+def count_query(conn, cursor, statement, parameters, context, executemany):
+    """before_cursor_execute hook that tallies SQL statements for the current request"""
+    if has_request_context() and not g.get('query_count_paused'):
+        g.query_count = g.get('query_count', 0) + 1
+
+@contextmanager
+def paused_query_count():
+    """Stop tallying queries, e.g. while a request dispatches internal sub-requests that share its g"""
+    paused = g.get('query_count_paused', False)
+    g.query_count_paused = True
+    try:
+        yield
+    finally:
+        g.query_count_paused = paused
+
+def register_query_counter(app):
+    """Report per-request SQL statement counts so N+1 regressions show up early"""
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', count_query)
+
+    @app.after_request
+    def report_query_count(response):
+        query_count = g.get('query_count', 0)
+        response.headers['X-Query-Count'] = str(query_count)
+        if query_count > app.config['QUERY_COUNT_WARN']:
+            app.logger.warning('%s issued %d SQL queries', request.path, query_count)
+        return response
 
 def create_app():
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
 
     # Configuration
     app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
     app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///btw_games.db')
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['TRACK_QUERY_COUNT'] = os.environ.get(
+        'TRACK_QUERY_COUNT',
+        '0' if os.environ.get('FLASK_ENV') == 'production' else '1'
+    ) == '1'
+    app.config['QUERY_COUNT_WARN'] = int(os.environ.get('QUERY_COUNT_WARN', 10))
+    app.config['SERVE_STATIC_PAGES'] = os.environ.get(
+        'SERVE_STATIC_PAGES',
+        '0' if os.environ.get('FLASK_ENV') == 'production' else '1'
+    ) == '1'
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'pool_pre_ping': True}
+    if not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+        # Keep pool_size * gunicorn workers below the database's max_connections
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'].update({
+            'pool_size': int(os.environ.get('DB_POOL_SIZE', 20)),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 40)),
+            'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+            'pool_use_lifo': True
+        })
+
+    # Response cache: Redis when configured, in-process otherwise
+    redis_url = os.environ.get('CACHE_REDIS_URL')
+    app.config['CACHE_TYPE'] = 'RedisCache' if redis_url else 'SimpleCache'
+    app.config['CACHE_REDIS_URL'] = redis_url
+    # With a prefix, cache.clear() deletes only 'view:*' keys instead of running
+    # FLUSHDB, so a Redis DB shared with the play queue keeps its pending plays
+    app.config['CACHE_KEY_PREFIX'] = os.environ.get('CACHE_KEY_PREFIX', 'view:')
+    app.config['CACHE_DEFAULT_TIMEOUT'] = int(os.environ.get('CACHE_DEFAULT_TIMEOUT', 300))
 
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
     ma.init_app(app)
+    cache.init_app(app)
     CORS(app)
 
     # Import models
@@ -34,12 +113,19 @@ def create_app():
     # Register blueprints
     from routes.api import api_bp
     from routes.admin import admin_bp
-    from routes.main import main_bp
+    from routes.main import main_bp, static_pages_bp
 
     app.register_blueprint(api_bp, url_prefix='/api')
     app.register_blueprint(admin_bp, url_prefix='/admin')
     app.register_blueprint(main_bp)
 
+    if app.config['TRACK_QUERY_COUNT']:
+        register_query_counter(app)
+
+    # nginx serves static pages in production; only route them through Flask when asked to
+    if app.config['SERVE_STATIC_PAGES']:
+        app.register_blueprint(static_pages_bp)
+
     return app
 
 if __name__ == '__main__':
@@ -0,0 +1,52 @@
+"""Add composite indexes for game list queries
+
+Revision ID: 3f8a2c1d9b7e
+Revises: 550316ec46d9
+Create Date: 2026-10-14 10:12:37.418206
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f8a2c1d9b7e'
+down_revision = '550316ec46d9'
+branch_labels = None
+depends_on = None
+
+
+GAME_INDEXES = [
+    ('ix_games_active_plays', ['is_active', 'total_plays']),
+    ('ix_games_active_release', ['is_active', 'release_date']),
+    ('ix_games_active_rating', ['is_active', 'rating']),
+    ('ix_games_active_title', ['is_active', 'title']),
+    ('ix_games_active_featured', ['is_active', 'is_featured']),
+    ('ix_games_active_new', ['is_active', 'is_new']),
+    ('ix_games_category_active_plays', ['category_id', 'is_active', 'total_plays']),
+]
+
+
+def upgrade():
+    # CONCURRENTLY keeps games writable while PostgreSQL builds each index
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, columns in GAME_INDEXES:
+                op.create_index(name, 'games', columns, unique=False, postgresql_concurrently=True)
+        return
+
+    with op.batch_alter_table('games', schema=None) as batch_op:
+        for name, columns in GAME_INDEXES:
+            batch_op.create_index(name, columns, unique=False)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, _ in reversed(GAME_INDEXES):
+                op.drop_index(name, table_name='games', postgresql_concurrently=True)
+        return
+
+    with op.batch_alter_table('games', schema=None) as batch_op:
+        for name, _ in reversed(GAME_INDEXES):
+            batch_op.drop_index(name)
@@ -0,0 +1,42 @@
+"""Store game tags as JSONB with a GIN index on PostgreSQL
+
+Revision ID: 8c4e6b2a1f30
+Revises: 3f8a2c1d9b7e
+Create Date: 2026-10-14 11:02:54.731290
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4e6b2a1f30'
+down_revision = '3f8a2c1d9b7e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # JSONB and GIN indexes are PostgreSQL-only; SQLite keeps the plain JSON column
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('ALTER TABLE games ALTER COLUMN tags TYPE jsonb USING tags::jsonb')
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_game_tags_gin',
+            'games',
+            ['tags'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_game_tags_gin', table_name='games', postgresql_concurrently=True)
+    op.execute('ALTER TABLE games ALTER COLUMN tags TYPE json USING tags::json')
@@ -0,0 +1,40 @@
+"""Add full-text search GIN index on PostgreSQL
+
+Revision ID: d17b5e9c4a62
+Revises: 8c4e6b2a1f30
+Create Date: 2026-10-14 11:47:08.215934
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd17b5e9c4a62'
+down_revision = '8c4e6b2a1f30'
+branch_labels = None
+depends_on = None
+
+# Must stay identical to routes.api.search_document() for the planner to use the index
+SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(long_description, '')), 'C')"
+)
+
+
+def upgrade():
+    # tsvector is PostgreSQL-only; SQLite keeps the ILIKE search fallback
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_games_search_gin ON games USING gin (({SEARCH_DOCUMENT}))')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_games_search_gin')
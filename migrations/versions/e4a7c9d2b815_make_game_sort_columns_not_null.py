@@ -0,0 +1,53 @@
+"""Make game sort columns NOT NULL
+
+Revision ID: e4a7c9d2b815
+Revises: 5b9e2f7c3a18
+Create Date: 2026-10-14 19:45:12.318406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a7c9d2b815'
+down_revision = '5b9e2f7c3a18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Backfill first so the NOT NULL constraints hold for existing rows
+    op.execute('UPDATE games SET total_plays = 0 WHERE total_plays IS NULL')
+    op.execute('UPDATE games SET rating = 0 WHERE rating IS NULL')
+    op.execute('UPDATE games SET release_date = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE release_date IS NULL')
+
+    with op.batch_alter_table('games', schema=None) as batch_op:
+        batch_op.alter_column('rating',
+               existing_type=sa.Float(),
+               nullable=False,
+               server_default='0')
+        batch_op.alter_column('total_plays',
+               existing_type=sa.Integer(),
+               nullable=False,
+               server_default='0')
+        batch_op.alter_column('release_date',
+               existing_type=sa.DateTime(),
+               nullable=False,
+               server_default=sa.text('CURRENT_TIMESTAMP'))
+
+
+def downgrade():
+    with op.batch_alter_table('games', schema=None) as batch_op:
+        batch_op.alter_column('release_date',
+               existing_type=sa.DateTime(),
+               nullable=True,
+               server_default=None)
+        batch_op.alter_column('total_plays',
+               existing_type=sa.Integer(),
+               nullable=True,
+               server_default=None)
+        batch_op.alter_column('rating',
+               existing_type=sa.Float(),
+               nullable=True,
+               server_default=None)
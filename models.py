@@ -1,6 +1,16 @@
 from app import db, ma
 from datetime import datetime
-from sqlalchemy import JSON
+from sqlalchemy import JSON, func, literal_column
+from sqlalchemy.dialects.postgresql import JSONB
+
+def weighted_search_document(title, description, long_description):
+    """Weighted tsvector over the game text columns; ix_games_search_gin indexes exactly this expression"""
+    config = literal_column("'english'")
+    return (
+        func.setweight(func.to_tsvector(config, func.coalesce(title, '')), literal_column("'A'"))
+        .op('||')(func.setweight(func.to_tsvector(config, func.coalesce(description, '')), literal_column("'B'")))
+        .op('||')(func.setweight(func.to_tsvector(config, func.coalesce(long_description, '')), literal_column("'C'")))
+    )
 
 class Category(db.Model):
     __tablename__ = 'categories'
@@ -33,19 +43,20 @@ class Game(db.Model):
     category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), nullable=False)
 
     # Game metadata
-    rating = db.Column(db.Float, default=0.0)
-    total_plays = db.Column(db.Integer, default=0)
+    # NOT NULL so the (is_active, <sort column>) indexes can serve ORDER BY and keyset cursors directly
+    rating = db.Column(db.Float, nullable=False, default=0.0, server_default='0')
+    total_plays = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     is_featured = db.Column(db.Boolean, default=False)
     is_new = db.Column(db.Boolean, default=True)
     is_active = db.Column(db.Boolean, default=True)
 
     # Game details
-    tags = db.Column(JSON)  # Store as JSON array
+    tags = db.Column(JSON().with_variant(JSONB, 'postgresql'))  # Store as JSON array (JSONB on PostgreSQL)
     features = db.Column(JSON)  # Store as JSON array
     controls = db.Column(JSON)  # Store as JSON object
 
     # Timestamps
-    release_date = db.Column(db.DateTime, default=datetime.utcnow)
+    release_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, server_default=db.text('CURRENT_TIMESTAMP'))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -53,6 +64,31 @@ class Game(db.Model):
     game_plays = db.relationship('GamePlay', backref='game', lazy=True, cascade='all, delete-orphan')
     game_stats = db.relationship('GameStats', backref='game', lazy=True, cascade='all, delete-orphan')
 
+    # Composite indexes matching the API's active-game filters and sort orders
+    __table_args__ = (
+        db.Index('ix_games_active_plays', 'is_active', 'total_plays'),
+        db.Index('ix_games_active_release', 'is_active', 'release_date'),
+        db.Index('ix_games_active_rating', 'is_active', 'rating'),
+        db.Index('ix_games_active_title', 'is_active', 'title'),
+        db.Index('ix_games_active_featured', 'is_active', 'is_featured'),
+        db.Index('ix_games_active_new', 'is_active', 'is_new'),
+        db.Index('ix_games_category_active_plays', 'category_id', 'is_active', 'total_plays'),
+        # Partial index over active rows only, for counts and scans that filter is_active and nothing else
+        db.Index(
+            'ix_games_active_partial', 'id',
+            postgresql_where=db.text('is_active = true'),
+            sqlite_where=db.text('is_active = 1')
+        ),
+        # GIN index for tag containment (@>) lookups; only meaningful on PostgreSQL
+        db.Index('ix_game_tags_gin', 'tags', postgresql_using='gin').ddl_if(dialect='postgresql'),
+        # GIN expression index for full-text search; created CONCURRENTLY by migration d17b5e9c4a62
+        db.Index(
+            'ix_games_search_gin',
+            weighted_search_document(title, description, long_description),
+            postgresql_using='gin'
+        ).ddl_if(dialect='postgresql'),
+    )
+
     @property
     def category_name(self):
         return self.category_obj.name if self.category_obj else None
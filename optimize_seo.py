@@ -1,12 +1,16 @@
 #!/usr/bin/env python3
 import json
+import mmap
 import os
 import re
+import orjson
 from datetime import date
+from pathlib import Path
 from bs4 import BeautifulSoup
 from xml.sax.saxutils import escape
 
 SITE_URL = "https://btwgame.com"
+ALL_GAMES_PATH = 'static_html/all_games.json'
 SITE_IMAGE = f"{SITE_URL}/assets/images/btwlogo.png"
 STATIC_PAGES = [
     "/about",
@@ -63,6 +67,15 @@ def ensure_meta(soup, attr_name, attr_value, content):
     tag['content'] = content
     return tag
 
+def load_games():
+    """Load the games array from all_games.json without copying the file into memory first"""
+    with open(ALL_GAMES_PATH, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            data = orjson.loads(view)
+
+    # Extract games array from the data structure
+    return data.get('games', []) if isinstance(data, dict) else data
+
 def load_categories():
     path = 'static_html/categories.json'
     if not os.path.exists(path):
@@ -282,22 +295,15 @@ def optimize_game_pages():
     """Optimize individual game pages"""
     print("🔧 Optimizing individual game pages...")
 
-    # Load games data
-    with open('static_html/all_games.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    # Extract games array from the data structure
-    games = data.get('games', []) if isinstance(data, dict) else data
+    games = load_games()
 
     for game in games:
-        game_file = f"static_html/games/{game['slug']}.html"
-        if not os.path.exists(game_file):
+        game_file = Path(f"static_html/games/{game['slug']}.html")
+        if not game_file.exists():
             continue
 
-        with open(game_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        soup = BeautifulSoup(content, 'html.parser')
+        # Hand BeautifulSoup the raw bytes and write encoded bytes back to skip a decode/encode round-trip
+        soup = BeautifulSoup(game_file.read_bytes(), 'html.parser', from_encoding='utf-8')
 
         # Update title
         title_tag = soup.find('title')
@@ -341,8 +347,7 @@ def optimize_game_pages():
         if canonical:
             canonical['href'] = f"https://btwgame.com/games/{game['slug']}"
 
-        with open(game_file, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        game_file.write_bytes(soup.encode('utf-8'))
 
     print(f"✅ Optimized {len(games)} individual game pages")
 
@@ -350,12 +355,7 @@ def generate_xml_sitemap():
     """Generate XML sitemap for better SEO"""
     print("🔧 Generating XML sitemap...")
 
-    # Load games data
-    with open('static_html/all_games.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    # Extract games array from the data structure
-    games = data.get('games', []) if isinstance(data, dict) else data
+    games = load_games()
 
     today = date.today().isoformat()
     categories = load_categories()
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Deferred game play recording backed by a Redis list
+
+When PLAY_QUEUE_REDIS_URL is set, the play endpoint pushes each play onto a
+Redis list and returns immediately. Running this module as a worker drains the
+list in batches and coalesces the plays into one stats update per game per day.
+A batch sits in the worker's own processing list until its transaction commits,
+so a failed write (or a worker crash) leaves the plays parked for the next pass
+instead of losing them, and several workers can drain the queue without touching
+each other's batches.
+
+When the database or Redis is unavailable the worker keeps its batch parked and
+backs off. A batch that keeps failing on bad data (malformed JSON, integrity or
+data errors) is retried one play at a time, and the plays that still fail are
+moved to a dead-letter list so they cannot block the queue. Once the cause is
+fixed, put them back on the queue with:
+
+    python play_queue.py --replay-dead
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import time
+from collections import defaultdict
+from datetime import date, datetime, timezone
+
+import redis
+from sqlalchemy.exc import DataError, IntegrityError
+
+QUEUE_KEY = 'plays:queue'
+PROCESSING_KEY_PREFIX = 'plays:processing:'
+DEAD_LETTER_KEY = 'plays:dead'
+
+# Consecutive failed flushes of a batch before its plays are written one by one
+MAX_FLUSH_ATTEMPTS = 3
+
+# Longest wait between retries while the database or Redis is down
+MAX_BACKOFF = 60
+
+# Failures caused by the plays themselves; anything else is treated as an outage and retried
+DATA_ERRORS = (IntegrityError, DataError, ValueError, KeyError, TypeError)
+
+# Resume the batch already on the processing list, or move a new one there from the head of the queue in one step
+TAKE_BATCH = """
+local parked = redis.call('LRANGE', KEYS[2], 0, -1)
+if #parked > 0 then
+    return parked
+end
+local items = redis.call('LRANGE', KEYS[1], 0, ARGV[1] - 1)
+if #items > 0 then
+    redis.call('LTRIM', KEYS[1], #items, -1)
+    redis.call('RPUSH', KEYS[2], unpack(items))
+end
+return items
+"""
+
+# Move every item of one list to the head of another, keeping their order
+MOVE_ALL = """
+local moved = 0
+while redis.call('LMOVE', KEYS[1], KEYS[2], 'RIGHT', 'LEFT') do
+    moved = moved + 1
+end
+return moved
+"""
+
+logger = logging.getLogger(__name__)
+
+_client = None
+
+def get_client():
+    """Return the shared Redis client, or None when the queue is not configured"""
+    global _client
+    redis_url = os.environ.get('PLAY_QUEUE_REDIS_URL')
+    if not redis_url:
+        return None
+    if _client is None:
+        _client = redis.Redis.from_url(redis_url)
+    return _client
+
+def enqueue_play(game_id, ip_address, user_agent, play_duration):
+    """Queue a play for the worker. Returns False when the queue is not configured or unreachable."""
+    client = get_client()
+    if client is None:
+        return False
+
+    try:
+        client.rpush(QUEUE_KEY, json.dumps({
+            'game_id': game_id,
+            'ip': ip_address,
+            'ua': user_agent,
+            'duration': play_duration,
+            'ts': time.time()
+        }))
+    except redis.RedisError:
+        # The caller records the play synchronously instead
+        logger.warning('Play queue unavailable; recording game %s synchronously', game_id, exc_info=True)
+        return False
+    return True
+
+def processing_key():
+    """This worker's processing list, plays:processing:<PLAY_WORKER_ID or hostname:pid>
+
+    In a container the hostname and pid survive a restart, so the restarted
+    worker finds its own parked batch; elsewhere set a stable PLAY_WORKER_ID.
+    """
+    worker_id = os.environ.get('PLAY_WORKER_ID') or f'{socket.gethostname()}:{os.getpid()}'
+    return PROCESSING_KEY_PREFIX + worker_id
+
+def pop_batch(client, batch_size, parked_key):
+    """Return the raw plays parked in parked_key, or park up to batch_size from the head of the queue there until ack_batch()"""
+    return client.eval(TAKE_BATCH, 2, QUEUE_KEY, parked_key, batch_size)
+
+def decode_plays(items):
+    """Parse raw queue items; a malformed item raises ValueError"""
+    return [json.loads(item) for item in items]
+
+def ack_batch(client, parked_key):
+    """Drop the parked batch once its plays are committed"""
+    client.delete(parked_key)
+
+def replay_dead_letters(client):
+    """Move every dead-lettered play back to the head of the queue; returns how many were moved"""
+    return client.eval(MOVE_ALL, 2, DEAD_LETTER_KEY, QUEUE_KEY)
+
+def upsert_daily_stats(game_id, played_on, plays, total_duration):
+    """Add plays to a game's GameStats row for played_on, creating it if needed, in one atomic statement"""
+    from app import db
+    from models import GameStats
+
+    if db.engine.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    statement = insert(GameStats).values(
+        game_id=game_id,
+        date=played_on,
+        daily_plays=plays,
+        unique_players=1,
+        avg_play_duration=total_duration / plays,
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow()
+    )
+    excluded = statement.excluded
+    set_ = {
+        'daily_plays': GameStats.daily_plays + excluded.daily_plays,
+        'updated_at': excluded.updated_at
+    }
+    # Plays without a duration leave the running average alone
+    if total_duration > 0:
+        previous = db.func.coalesce(GameStats.daily_plays, 0)
+        set_['avg_play_duration'] = (
+            (db.func.coalesce(GameStats.avg_play_duration, 0) * previous + total_duration)
+            / (previous + excluded.daily_plays)
+        )
+    db.session.execute(statement.on_conflict_do_update(index_elements=['game_id', 'date'], set_=set_))
+
+def flush_plays(plays):
+    """Write a batch of queued plays, coalescing increments per game and per day"""
+    from app import db
+    from models import Game, GamePlay
+
+    if not plays:
+        return 0
+
+    game_plays = defaultdict(int)
+    daily = defaultdict(lambda: {'plays': 0, 'duration': 0})
+    rows = []
+    for play in plays:
+        played_at = datetime.fromtimestamp(play['ts'], timezone.utc).replace(tzinfo=None)
+        played_on = date.fromtimestamp(play['ts'])
+        game_plays[play['game_id']] += 1
+        daily[(play['game_id'], played_on)]['plays'] += 1
+        daily[(play['game_id'], played_on)]['duration'] += play['duration']
+        rows.append({
+            'game_id': play['game_id'],
+            'ip_address': play['ip'],
+            'user_agent': play['ua'],
+            'play_duration': play['duration'],
+            'created_at': played_at
+        })
+
+    db.session.bulk_insert_mappings(GamePlay, rows)
+
+    # One UPDATE per game instead of one per play
+    for game_id, count in game_plays.items():
+        Game.query.filter(Game.id == game_id).update(
+            {Game.total_plays: Game.total_plays + count},
+            synchronize_session=False
+        )
+
+    # One upsert per game per day; the database does the arithmetic, so concurrent writers can't lose updates
+    for (game_id, played_on), totals in daily.items():
+        upsert_daily_stats(game_id, played_on, totals['plays'], totals['duration'])
+
+    db.session.commit()
+
+    # Cached game and stats responses would otherwise keep the old play counts until they expire.
+    # The plays are already committed, so a failure here must not send the batch back for a retry.
+    from routes.api import invalidate_play_caches
+    try:
+        invalidate_play_caches(
+            db.session.query(Game.id, Game.slug).filter(Game.id.in_(list(game_plays))).all()
+        )
+    except Exception:
+        logger.exception('Failed to invalidate cached play counts')
+    return len(plays)
+
+def flush_individually(client, items, parked_key):
+    """Write parked plays one at a time, dead-lettering each one whose data can't be recorded; returns the number recorded
+
+    Each play leaves the parked list once it is committed or dead-lettered, so
+    an outage part way through raises with only the unwritten plays still parked.
+    """
+    from app import db
+
+    flushed = 0
+    for item in items:
+        try:
+            flushed += flush_plays(decode_plays([item]))
+        except DATA_ERRORS:
+            db.session.rollback()
+            client.rpush(DEAD_LETTER_KEY, item)
+            logger.exception('Moved an unrecordable play to %s: %r', DEAD_LETTER_KEY, item)
+        except Exception:
+            db.session.rollback()
+            raise
+        client.lrem(parked_key, 1, item)
+    return flushed
+
+def run_worker(batch_size=500, idle_sleep=1.0):
+    """Drain the play queue forever"""
+    from app import create_app, db
+
+    client = get_client()
+    if client is None:
+        logger.error('PLAY_QUEUE_REDIS_URL is not set')
+        return
+
+    app = create_app()
+    with app.app_context():
+        parked_key = processing_key()
+
+        # A batch this worker left parked before a crash is picked up again by the first pop_batch();
+        # other workers' processing lists are theirs to recover
+        parked = client.llen(parked_key)
+        if parked:
+            logger.warning('Resuming %d game plays left over from an unfinished batch', parked)
+
+        logger.info('Flushing game plays from %s via %s (batch size: %d)', QUEUE_KEY, parked_key, batch_size)
+        failures = 0
+        backoff = idle_sleep
+        while True:
+            try:
+                items = pop_batch(client, batch_size, parked_key)
+                if failures >= MAX_FLUSH_ATTEMPTS:
+                    flushed = flush_individually(client, items, parked_key)
+                else:
+                    flushed = flush_plays(decode_plays(items))
+                ack_batch(client, parked_key)
+                failures = 0
+            except DATA_ERRORS:
+                db.session.rollback()
+                failures += 1
+                if failures < MAX_FLUSH_ATTEMPTS:
+                    logger.exception('Failed to record game plays (attempt %d); batch kept for retry', failures)
+                else:
+                    logger.exception('Failed to record game plays %d times; retrying them one by one', failures)
+                flushed = 0
+            except Exception:
+                # Database or Redis outage: the batch stays parked, nothing is dead-lettered
+                db.session.rollback()
+                logger.exception('Could not record game plays; retrying the parked batch in %.0fs', backoff)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF)
+                continue
+            backoff = idle_sleep
+            if flushed:
+                logger.info('Recorded %d game plays', flushed)
+            else:
+                time.sleep(idle_sleep)
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    parser = argparse.ArgumentParser(description='Drain queued game plays into the database')
+    parser.add_argument(
+        '--replay-dead',
+        action='store_true',
+        help=f'Move plays from {DEAD_LETTER_KEY} back onto {QUEUE_KEY} and exit'
+    )
+    args = parser.parse_args()
+
+    if args.replay_dead:
+        client = get_client()
+        if client is None:
+            logger.error('PLAY_QUEUE_REDIS_URL is not set')
+        else:
+            logger.info('Moved %d game plays from %s back onto %s', replay_dead_letters(client), DEAD_LETTER_KEY, QUEUE_KEY)
+    else:
+        run_worker()
@@ -1,7 +1,8 @@
-from flask import Blueprint, jsonify, request, render_template
+from flask import Blueprint, jsonify, request, render_template, current_app
 from models import Game, Category, GameStats, games_schema, game_schema, categories_schema, category_schema
-from app import db
+from app import db, cache, paused_query_count
 from datetime import datetime
+from sqlalchemy import func, literal
 import json
 
 admin_bp = Blueprint('admin', __name__)
@@ -99,6 +100,8 @@ def admin_create_game():
 
         db.session.add(game)
         db.session.commit()
+        # Drop cached API responses so the change is visible immediately
+        cache.clear()
 
         return jsonify({
             'message': 'Game created successfully',
@@ -132,6 +135,7 @@ def admin_update_game(game_id):
 
         game.updated_at = datetime.utcnow()
         db.session.commit()
+        cache.clear()
 
         return jsonify({
             'message': 'Game updated successfully',
@@ -155,6 +159,7 @@ def admin_delete_game(game_id):
         game.is_active = False
         game.updated_at = datetime.utcnow()
         db.session.commit()
+        cache.clear()
 
         return jsonify({'message': 'Game deleted successfully'})
 
@@ -198,6 +203,7 @@ def admin_create_category():
 
         db.session.add(category)
         db.session.commit()
+        cache.clear()
 
         return jsonify({
             'message': 'Category created successfully',
@@ -225,6 +231,7 @@ def admin_update_category(category_id):
                 setattr(category, field, data[field])
 
         db.session.commit()
+        cache.clear()
 
         return jsonify({
             'message': 'Category updated successfully',
@@ -245,12 +252,14 @@ def admin_delete_category(category_id):
             return jsonify({'error': 'Category not found'}), 404
 
         # Check if category has games
-        games_count = Game.query.filter_by(category_id=category_id).count()
+        games_count = db.session.query(func.count(literal(1))).select_from(Game)\
+            .filter(Game.category_id == category_id).scalar()
         if games_count > 0:
             return jsonify({'error': f'Cannot delete category with {games_count} games'}), 400
 
         db.session.delete(category)
         db.session.commit()
+        cache.clear()
 
         return jsonify({'message': 'Category deleted successfully'})
 
@@ -264,12 +273,12 @@ def admin_delete_category(category_id):
 def admin_dashboard_stats():
     """Get dashboard statistics"""
     try:
-        from sqlalchemy import func
         from datetime import date, timedelta
 
-        # Basic stats
-        total_games = Game.query.filter_by(is_active=True).count()
-        total_categories = Category.query.count()
+        # Basic stats; plain SELECT count(1) instead of Query.count()'s subquery wrapper
+        total_games = db.session.query(func.count(literal(1))).select_from(Game)\
+            .filter(Game.is_active == True).scalar()
+        total_categories = db.session.query(func.count(literal(1))).select_from(Category).scalar()
         total_plays = db.session.query(func.sum(Game.total_plays)).scalar() or 0
 
         # Today's stats
@@ -336,24 +345,84 @@ def admin_bulk_update_games():
         if not game_ids:
             return jsonify({'error': 'No game IDs provided'}), 400
 
+        # Normalize to ints up front so "1" and 1 name the same game; bools and floats are not IDs
+        if not isinstance(game_ids, list) or any(isinstance(game_id, (bool, float)) for game_id in game_ids):
+            return jsonify({'error': 'Game IDs must be a list of integers'}), 400
+        try:
+            game_ids = {int(game_id) for game_id in game_ids}
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Game IDs must be a list of integers'}), 400
+
+        # Validate all IDs with a single IN query instead of one lookup per game
+        found_ids = {row[0] for row in db.session.query(Game.id).filter(Game.id.in_(game_ids)).all()}
+        missing_ids = sorted(game_ids - found_ids)
+
+        # Only real columns can be written by a bulk UPDATE
+        columns = Game.__table__.columns.keys()
+        values = {field: value for field, value in updates.items() if field in columns}
+        values['updated_at'] = datetime.utcnow()
+
         # Update games
         updated_count = 0
-        for game_id in game_ids:
-            game = Game.query.get(game_id)
-            if game:
-                for field, value in updates.items():
-                    if hasattr(game, field):
-                        setattr(game, field, value)
-                game.updated_at = datetime.utcnow()
-                updated_count += 1
+        if found_ids:
+            updated_count = Game.query.filter(Game.id.in_(found_ids)).update(
+                values,
+                synchronize_session=False
+            )
 
         db.session.commit()
+        cache.clear()
 
         return jsonify({
             'message': f'Successfully updated {updated_count} games',
-            'updated_count': updated_count
+            'updated_count': updated_count,
+            'missing_ids': missing_ids
         })
 
     except Exception as e:
         db.session.rollback()
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+# Cache warming
+# The list queries static/assets/js/api.js builds for its featured, new and
+# popular game helpers, plus the category list
+WARM_CACHE_PATHS = [
+    '/api/games?featured=true&per_page=6&sort=popular',
+    '/api/games?new=true&per_page=6&sort=newest',
+    '/api/games?per_page=6&sort=popular',
+    '/api/categories',
+]
+
+@admin_bp.route('/cache/warm', methods=['POST'])
+@admin_required
+def admin_warm_cache():
+    """Prime cached API responses, optionally recording a data verification summary.
+
+    Entries land in the configured cache backend, so warming reaches every
+    gunicorn worker only with a shared Redis cache (CACHE_REDIS_URL); the
+    in-process SimpleCache fallback warms just the worker serving this request.
+    """
+    try:
+        summary = request.get_json(silent=True) or {}
+        missing_per_field = summary.get('missing_per_field') or {}
+        if missing_per_field:
+            current_app.logger.warning(f"Frontend data incomplete: {missing_per_field}")
+
+        # Call each @cache.cached view directly so it stores its response; skipping the
+        # request hooks and the query counter keeps this request's own headers and X-Query-Count honest
+        warmed = {}
+        with paused_query_count():
+            for path in WARM_CACHE_PATHS:
+                with current_app.test_request_context(path):
+                    view = current_app.view_functions[request.url_rule.endpoint]
+                    warmed[path] = current_app.make_response(view(**request.view_args)).status_code
+
+        return jsonify({
+            'message': f'Warmed {len(warmed)} cached responses',
+            'warmed': warmed,
+            'shared_cache': current_app.config['CACHE_TYPE'] == 'RedisCache',
+            'all_complete': summary.get('all_complete')
+        })
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
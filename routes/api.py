@@ -1,12 +1,187 @@
-from flask import Blueprint, jsonify, request
-from models import Game, Category, GamePlay, GameStats, games_schema, game_schema, categories_schema, category_schema
-from app import db
-from sqlalchemy import desc, func, and_
+from flask import Blueprint, current_app, jsonify, request
+from models import Game, Category, GamePlay, GameStats, weighted_search_document, games_schema, game_schema, categories_schema, category_schema
+from app import db, cache
+from play_queue import enqueue_play, upsert_daily_stats
+from sqlalchemy import desc, func, and_, type_coerce, literal_column, tuple_
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import contains_eager, joinedload, selectinload, Load
 from datetime import datetime, date
+import hashlib
 import json
+import math
 
 api_bp = Blueprint('api', __name__)
 
+def with_game_relations(query, category_joined=False):
+    """Eager-load the relationships GameSchema serializes so dumping a page doesn't issue a query per game.
+
+    Pass category_joined=True when the query already joins Category (to filter
+    on it), so the category is read from that join rather than a second one.
+    Any other relationship raises instead of lazy loading, so a new N+1 fails
+    the request (and test_query_counts.py) rather than quietly adding queries.
+    """
+    return query.options(
+        contains_eager(Game.category_obj) if category_joined else joinedload(Game.category_obj),
+        selectinload(Game.game_plays),
+        selectinload(Game.game_stats),
+        Load(Game).raiseload('*')
+    )
+
+def tags_contain(tag):
+    """Tag containment filter; on PostgreSQL this compiles to JSONB @> so the GIN index is used"""
+    if db.engine.dialect.name == 'postgresql':
+        return type_coerce(Game.tags, JSONB).contains([tag])
+    return Game.tags.contains([tag])
+
+def search_document():
+    """Weighted tsvector over title/description/long_description, matching the ix_games_search_gin expression index"""
+    return weighted_search_document(Game.title, Game.description, Game.long_description)
+
+def search_query(text):
+    """plainto_tsquery for user search text, using the same 'english' config as search_document()"""
+    return func.plainto_tsquery(literal_column("'english'"), text)
+
+def search_filter(text):
+    """Full-text match on PostgreSQL; substring ILIKE fallback elsewhere"""
+    if db.engine.dialect.name == 'postgresql':
+        return search_document().op('@@')(search_query(text))
+
+    # Escape LIKE wildcards so user input only ever matches literally
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    search_term = f'%{escaped}%'
+    return db.or_(
+        Game.title.ilike(search_term, escape='\\'),
+        Game.description.ilike(search_term, escape='\\'),
+        Game.long_description.ilike(search_term, escape='\\')
+    )
+
+class WindowPagination:
+    """Page of results whose total comes from COUNT(*) OVER() in the same SELECT, instead of a second COUNT query"""
+
+    def __init__(self, query, page, per_page):
+        page = max(page, 1)
+        if per_page < 1:
+            per_page = 20
+
+        rows = query.add_columns(func.count().over().label('total'))\
+            .limit(per_page)\
+            .offset((page - 1) * per_page)\
+            .all()
+
+        self.items = [row[0] for row in rows]
+        if rows:
+            self.total = rows[0].total
+        elif page > 1:
+            # Past the last page there are no rows to carry the window count
+            self.total = query.order_by(None).count()
+        else:
+            self.total = 0
+
+        self.pages = math.ceil(self.total / per_page)
+        self.has_prev = page > 1
+        self.has_next = page < self.pages
+
+# Sort column, whether it sorts descending, and how to parse its value back out of a cursor
+# sort key -> (column, descending, cursor value parser); every sort column is NOT NULL,
+# so the keyset tuple comparison can't skip rows and ORDER BY can walk the matching index
+SORT_KEYS = {
+    'popular': (Game.total_plays, True, int),
+    'newest': (Game.release_date, True, datetime.fromisoformat),
+    'rating': (Game.rating, True, float),
+    'name': (Game.title, False, str),
+}
+
+def apply_sort(query, sort_by):
+    """Order by the requested sort key, with id as a tiebreaker so keyset cursors are stable"""
+    sort_key = SORT_KEYS.get(sort_by)
+    if not sort_key:
+        return query
+    column, descending, _ = sort_key
+    if descending:
+        return query.order_by(desc(column), desc(Game.id))
+    return query.order_by(column, Game.id)
+
+def make_cursor(sort_by, game):
+    """Encode the position just after game as an `after` cursor"""
+    column, _, _ = SORT_KEYS[sort_by]
+    value = getattr(game, column.key)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return f'{value},{game.id}'
+
+def after_cursor(sort_by, cursor):
+    """Keyset filter for rows after the cursor; raises ValueError on a malformed cursor"""
+    column, descending, parse = SORT_KEYS[sort_by]
+    value, game_id = cursor.rsplit(',', 1)
+    position = tuple_(parse(value), int(game_id))
+    if descending:
+        return tuple_(column, Game.id) < position
+    return tuple_(column, Game.id) > position
+
+def keyset_page(query, sort_by, cursor, per_page):
+    """Fetch one page after the cursor without an OFFSET scan, returning (games, next_cursor)"""
+    games = query.filter(after_cursor(sort_by, cursor)).limit(per_page + 1).all()
+    next_cursor = make_cursor(sort_by, games[per_page - 1]) if len(games) > per_page else None
+    return games[:per_page], next_cursor
+
+def parse_play_duration(payload):
+    """Whole seconds from a play request body; raises ValueError unless duration is a non-negative number"""
+    duration = payload.get('duration') if isinstance(payload, dict) else None
+    if duration is None:
+        return 0
+    if isinstance(duration, bool) or not isinstance(duration, (int, float, str)):
+        raise ValueError(duration)
+    try:
+        seconds = int(float(duration))
+    except OverflowError:
+        raise ValueError(duration)
+    if seconds < 0:
+        raise ValueError(duration)
+    return seconds
+
+def cacheable_response(rv):
+    """response_filter for @cache.cached: store only 200 responses, never errors or 404s"""
+    if isinstance(rv, tuple):
+        status = rv[1] if len(rv) > 1 and isinstance(rv[1], int) else 200
+    else:
+        status = getattr(rv, 'status_code', 200)
+    return status == 200
+
+def view_cache_key(path):
+    """Key @cache.cached stores a view's response under when it isn't keyed on the query string"""
+    return f'view/{path}'
+
+def invalidate_play_caches(games):
+    """Drop cached responses that show play counts, for an iterable of (game id, slug) pairs.
+
+    Query-string keyed lists (/api/games, /api/search) can't be addressed per
+    game, so they rely on their short timeouts instead.
+    """
+    keys = [view_cache_key('/api/stats/games')]
+    for game_id, slug in games:
+        keys.append(view_cache_key(f'/api/games/{game_id}'))
+        keys.append(view_cache_key(f'/api/games/slug/{slug}'))
+    cache.delete_many(*keys)
+
+# Browser/CDN cache lifetimes in seconds; unlisted GET endpoints use the default
+CACHE_MAX_AGE = {
+    'api.get_categories': 600,
+    'api.get_game': 300,
+    'api.get_game_by_slug': 300,
+}
+DEFAULT_CACHE_MAX_AGE = 60
+
+@api_bp.after_request
+def add_cache_headers(response):
+    """Tag successful GET responses with an ETag and answer matching If-None-Match with 304"""
+    if request.method != 'GET' or response.status_code != 200 or response.direct_passthrough:
+        return response
+
+    max_age = CACHE_MAX_AGE.get(request.endpoint, DEFAULT_CACHE_MAX_AGE)
+    response.set_etag(hashlib.blake2b(response.get_data(), digest_size=16).hexdigest())
+    response.headers['Cache-Control'] = f'public, max-age={max_age}, stale-while-revalidate={max_age * 2}'
+    return response.make_conditional(request)
+
 # Error handlers
 @api_bp.errorhandler(404)
 def not_found(error):
@@ -22,6 +197,7 @@ def internal_error(error):
 
 # Games API endpoints
 @api_bp.route('/games', methods=['GET'])
+@cache.cached(timeout=60, response_filter=cacheable_response, query_string=True)
 def get_games():
     """Get all games with optional filtering and pagination"""
     try:
@@ -33,13 +209,16 @@ def get_games():
         sort_by = request.args.get('sort', 'popular')  # popular, newest, rating, name
         featured = request.args.get('featured', type=bool)
         new = request.args.get('new', type=bool)
+        after = request.args.get('after')
 
         # Base query
         query = Game.query.filter(Game.is_active == True)
 
         # Apply filters
-        if category and category != 'all':
+        category_joined = bool(category and category != 'all')
+        if category_joined:
             query = query.join(Category).filter(Category.slug == category)
+        query = with_game_relations(query, category_joined)
 
         if search:
             search_term = f'%{search}%'
@@ -47,7 +226,7 @@ def get_games():
                 db.or_(
                     Game.title.ilike(search_term),
                     Game.description.ilike(search_term),
-                    Game.tags.contains([search])
+                    tags_contain(search)
                 )
             )
 
@@ -58,24 +237,31 @@ def get_games():
             query = query.filter(Game.is_new == new)
 
         # Apply sorting
-        if sort_by == 'popular':
-            query = query.order_by(desc(Game.total_plays))
-        elif sort_by == 'newest':
-            query = query.order_by(desc(Game.release_date))
-        elif sort_by == 'rating':
-            query = query.order_by(desc(Game.rating))
-        elif sort_by == 'name':
-            query = query.order_by(Game.title)
+        query = apply_sort(query, sort_by)
 
         # Pagination
         if per_page > 100:  # Limit max per_page
             per_page = 100
+        if per_page < 1:
+            per_page = 20
+
+        # Keyset pagination: ?after=<sort value>,<id> seeks past the previous page instead of using OFFSET
+        if after and sort_by in SORT_KEYS:
+            try:
+                games, next_cursor = keyset_page(query, sort_by, after, per_page)
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+
+            return jsonify({
+                'games': games_schema.dump(games),
+                'pagination': {
+                    'per_page': per_page,
+                    'has_next': next_cursor is not None,
+                    'next_cursor': next_cursor
+                }
+            })
 
-        paginated_games = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
+        paginated_games = WindowPagination(query, page, per_page)
 
         result = games_schema.dump(paginated_games.items)
 
@@ -87,7 +273,9 @@ def get_games():
                 'total': paginated_games.total,
                 'pages': paginated_games.pages,
                 'has_next': paginated_games.has_next,
-                'has_prev': paginated_games.has_prev
+                'has_prev': paginated_games.has_prev,
+                'next_cursor': make_cursor(sort_by, paginated_games.items[-1])
+                    if paginated_games.has_next and sort_by in SORT_KEYS else None
             }
         })
 
@@ -95,6 +283,7 @@ def get_games():
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/games/<int:game_id>', methods=['GET'])
+@cache.cached(timeout=300, response_filter=cacheable_response)
 def get_game(game_id):
     """Get a specific game by ID"""
     try:
@@ -109,6 +298,7 @@ def get_game(game_id):
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/games/slug/<string:slug>', methods=['GET'])
+@cache.cached(timeout=300, response_filter=cacheable_response)
 def get_game_by_slug(slug):
     """Get a specific game by slug"""
     try:
@@ -122,6 +312,31 @@ def get_game_by_slug(slug):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Upper bound on slugs per existence check, so one request cannot build an unbounded IN list
+MAX_EXISTS_SLUGS = 100
+
+@api_bp.route('/games/exists', methods=['GET'])
+@cache.cached(timeout=60, response_filter=cacheable_response, query_string=True)
+def games_exist():
+    """Check which of a comma-separated list of slugs are active games"""
+    try:
+        slugs = [slug.strip() for slug in request.args.get('slugs', '').split(',') if slug.strip()]
+        if len(slugs) > MAX_EXISTS_SLUGS:
+            return jsonify({'error': f'At most {MAX_EXISTS_SLUGS} slugs per request'}), 400
+
+        found = set()
+        if slugs:
+            found = {
+                row.slug for row in db.session.query(Game.slug).filter(
+                    Game.slug.in_(slugs), Game.is_active == True
+                )
+            }
+
+        return jsonify({'games': {slug: slug in found for slug in slugs}})
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @api_bp.route('/games/<int:game_id>/play', methods=['POST'])
 def record_game_play(game_id):
     """Record a game play session"""
@@ -133,7 +348,14 @@ def record_game_play(game_id):
         # Get client information
         ip_address = request.environ.get('HTTP_X_FORWARDED_FOR', request.environ.get('REMOTE_ADDR'))
         user_agent = request.headers.get('User-Agent', '')
-        play_duration = request.json.get('duration', 0) if request.json else 0
+        try:
+            play_duration = parse_play_duration(request.get_json(silent=True) or {})
+        except ValueError:
+            return jsonify({'error': 'duration must be a non-negative number of seconds'}), 400
+
+        # Hand off to the play queue worker when one is configured
+        if enqueue_play(game_id, ip_address, user_agent, play_duration):
+            return jsonify({'message': 'Game play queued'}), 202
 
         # Record game play
         game_play = GamePlay(
@@ -144,42 +366,32 @@ def record_game_play(game_id):
         )
         db.session.add(game_play)
 
-        # Increment game plays
-        game.increment_plays()
-
-        # Update daily stats
-        today = date.today()
-        game_stat = GameStats.query.filter(
-            GameStats.game_id == game_id,
-            GameStats.date == today
-        ).first()
-
-        if game_stat:
-            game_stat.daily_plays += 1
-            # Update average play duration
-            if play_duration > 0:
-                total_duration = game_stat.avg_play_duration * (game_stat.daily_plays - 1) + play_duration
-                game_stat.avg_play_duration = total_duration / game_stat.daily_plays
-        else:
-            game_stat = GameStats(
-                game_id=game_id,
-                date=today,
-                daily_plays=1,
-                unique_players=1,
-                avg_play_duration=play_duration
-            )
-            db.session.add(game_stat)
+        # Increment game plays in the same transaction rather than through increment_plays()'s own commit
+        Game.query.filter(Game.id == game_id).update(
+            {Game.total_plays: Game.total_plays + 1},
+            synchronize_session=False
+        )
 
-        db.session.commit()
+        # Create or increment today's stats row in one upsert, so concurrent first plays can't collide on _game_date_uc
+        upsert_daily_stats(game_id, date.today(), 1, play_duration)
 
-        return jsonify({'message': 'Game play recorded successfully'})
+        db.session.commit()
 
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+    # The play is already committed, so a cache failure must not turn into a 500 the client retries
+    try:
+        invalidate_play_caches([(game.id, game.slug)])
+    except Exception:
+        current_app.logger.exception('Failed to invalidate cached play counts')
+
+    return jsonify({'message': 'Game play recorded successfully'})
+
 # Categories API endpoints
 @api_bp.route('/categories', methods=['GET'])
+@cache.cached(timeout=600, response_filter=cacheable_response)
 def get_categories():
     """Get all categories"""
     try:
@@ -196,19 +408,36 @@ def get_games_by_category(category_id):
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
+        after = request.args.get('after')
 
         category = Category.query.get(category_id)
         if not category:
             return jsonify({'error': 'Category not found'}), 404
 
-        paginated_games = Game.query.filter(
+        games_query = apply_sort(with_game_relations(Game.query).filter(
             Game.category_id == category_id,
             Game.is_active == True
-        ).order_by(desc(Game.total_plays)).paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
+        ), 'popular')
+
+        if after:
+            if per_page < 1:
+                per_page = 20
+            try:
+                games, next_cursor = keyset_page(games_query, 'popular', after, per_page)
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+
+            return jsonify({
+                'category': category_schema.dump(category),
+                'games': games_schema.dump(games),
+                'pagination': {
+                    'per_page': per_page,
+                    'has_next': next_cursor is not None,
+                    'next_cursor': next_cursor
+                }
+            })
+
+        paginated_games = WindowPagination(games_query, page, per_page)
 
         result = games_schema.dump(paginated_games.items)
 
@@ -221,7 +450,9 @@ def get_games_by_category(category_id):
                 'total': paginated_games.total,
                 'pages': paginated_games.pages,
                 'has_next': paginated_games.has_next,
-                'has_prev': paginated_games.has_prev
+                'has_prev': paginated_games.has_prev,
+                'next_cursor': make_cursor('popular', paginated_games.items[-1])
+                    if paginated_games.has_next else None
             }
         })
 
@@ -230,16 +461,25 @@ def get_games_by_category(category_id):
 
 # Statistics API endpoints
 @api_bp.route('/stats/games', methods=['GET'])
+@cache.cached(timeout=60, response_filter=cacheable_response)
 def get_games_stats():
     """Get overall games statistics"""
     try:
-        total_games = Game.query.filter(Game.is_active == True).count()
-        total_plays = db.session.query(func.sum(Game.total_plays)).scalar() or 0
-        featured_games = Game.query.filter(Game.is_featured == True, Game.is_active == True).count()
-        new_games = Game.query.filter(Game.is_new == True, Game.is_active == True).count()
+        # All four aggregates in one pass over the games table
+        totals = db.session.query(
+            func.count().filter(Game.is_active == True).label('total_games'),
+            func.sum(Game.total_plays).label('total_plays'),
+            func.count().filter(Game.is_featured == True, Game.is_active == True).label('featured_games'),
+            func.count().filter(Game.is_new == True, Game.is_active == True).label('new_games')
+        ).select_from(Game).one()
+
+        total_games = totals.total_games
+        total_plays = totals.total_plays or 0
+        featured_games = totals.featured_games
+        new_games = totals.new_games
 
         # Most popular games
-        popular_games = Game.query.filter(Game.is_active == True)\
+        popular_games = with_game_relations(Game.query).filter(Game.is_active == True)\
             .order_by(desc(Game.total_plays))\
             .limit(5)\
             .all()
@@ -266,7 +506,13 @@ def get_game_stats(game_id):
             return jsonify({'error': 'Game not found'}), 404
 
         # Get daily stats for the last 30 days
-        daily_stats = GameStats.query.filter(
+        # Only the columns the response needs, as plain rows rather than tracked ORM objects
+        daily_stats = db.session.query(
+            GameStats.date,
+            GameStats.daily_plays,
+            GameStats.unique_players,
+            GameStats.avg_play_duration
+        ).filter(
             GameStats.game_id == game_id
         ).order_by(desc(GameStats.date)).limit(30).all()
 
@@ -287,50 +533,57 @@ def get_game_stats(game_id):
         return jsonify({'error': str(e)}), 500
 
 # Search API endpoints
+MIN_SEARCH_LENGTH = 3
+
 @api_bp.route('/search', methods=['GET'])
+@cache.cached(timeout=60, response_filter=cacheable_response, query_string=True)
 def search_games():
     """Search games with advanced filtering"""
     try:
-        query_param = request.args.get('q', '')
+        query_param = request.args.get('q', '').strip()
         category = request.args.get('category')
-        sort_by = request.args.get('sort', 'popular')
+        sort_by = request.args.get('sort', 'relevance')
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
 
         if not query_param:
             return jsonify({'error': 'Search query is required'}), 400
 
+        # One or two characters match nearly everything; skip the database entirely
+        if len(query_param) < MIN_SEARCH_LENGTH:
+            return jsonify({
+                'query': query_param,
+                'games': [],
+                'pagination': {
+                    'page': page,
+                    'per_page': per_page,
+                    'total': 0,
+                    'pages': 0,
+                    'has_next': False,
+                    'has_prev': False
+                }
+            })
+
         # Build search query
-        search_term = f'%{query_param}%'
         query = Game.query.filter(
             Game.is_active == True,
-            db.or_(
-                Game.title.ilike(search_term),
-                Game.description.ilike(search_term),
-                Game.long_description.ilike(search_term)
-            )
+            search_filter(query_param)
         )
 
         # Category filter
-        if category and category != 'all':
+        category_joined = bool(category and category != 'all')
+        if category_joined:
             query = query.join(Category).filter(Category.slug == category)
+        query = with_game_relations(query, category_joined)
 
-        # Sorting
-        if sort_by == 'popular':
-            query = query.order_by(desc(Game.total_plays))
-        elif sort_by == 'newest':
-            query = query.order_by(desc(Game.release_date))
-        elif sort_by == 'rating':
-            query = query.order_by(desc(Game.rating))
-        elif sort_by == 'name':
-            query = query.order_by(Game.title)
+        # Sorting: best full-text matches first on PostgreSQL; ILIKE has no rank, so relevance means popular elsewhere
+        if sort_by == 'relevance' and db.engine.dialect.name == 'postgresql':
+            query = query.order_by(desc(func.ts_rank(search_document(), search_query(query_param))), desc(Game.id))
+        else:
+            query = apply_sort(query, 'popular' if sort_by == 'relevance' else sort_by)
 
         # Pagination
-        paginated_games = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
+        paginated_games = WindowPagination(query, page, per_page)
 
         result = games_schema.dump(paginated_games.items)
 
@@ -1,23 +1,13 @@
 from flask import Blueprint, render_template, send_from_directory, abort
 from models import Game, Category
+from sqlalchemy import case, desc
+from sqlalchemy.orm import load_only
 import os
 
 main_bp = Blueprint('main', __name__)
 
-@main_bp.route('/')
-def index():
-    """Serve the main index page"""
-    return send_from_directory('static', 'index.html')
-
-@main_bp.route('/games')
-def games():
-    """Serve the games listing page"""
-    return send_from_directory('static', 'games.html')
-
-@main_bp.route('/game')
-def game_detail():
-    """Serve the individual game page"""
-    return send_from_directory('static', 'game.html')
+# Plain file routes for local development; in production nginx serves these directly
+static_pages_bp = Blueprint('static_pages', __name__)
 
 @main_bp.route('/games/<slug>')
 def game_detail_by_slug(slug):
@@ -26,21 +16,17 @@ def game_detail_by_slug(slug):
     if not game:
         abort(404)
 
-    # Get related games from the same category
-    related_games = Game.query.filter(
-        Game.category_id == game.category_id,
+    # Related games: same category first, topped up from other categories, in one query
+    related_games = Game.query.options(
+        load_only(Game.id, Game.slug, Game.title, Game.description, Game.thumbnail_url)
+    ).filter(
         Game.id != game.id,
         Game.is_active == True
+    ).order_by(
+        case((Game.category_id == game.category_id, 0), else_=1),
+        desc(Game.total_plays)
     ).limit(4).all()
 
-    # If not enough related games, get some from other categories
-    if len(related_games) < 4:
-        additional_games = Game.query.filter(
-            Game.id != game.id,
-            Game.is_active == True
-        ).limit(4 - len(related_games)).all()
-        related_games.extend(additional_games)
-
     return render_template('game.html', game=game, related_games=related_games)
 
 @main_bp.route('/games/monster-survivors')
@@ -52,33 +38,48 @@ def monster_survivors():
     else:
         return send_from_directory('static', 'monster-survivors.html')
 
-@main_bp.route('/admin')
+@static_pages_bp.route('/')
+def index():
+    """Serve the main index page"""
+    return send_from_directory('static', 'index.html')
+
+@static_pages_bp.route('/games')
+def games():
+    """Serve the games listing page"""
+    return send_from_directory('static', 'games.html')
+
+@static_pages_bp.route('/game')
+def game_detail():
+    """Serve the individual game page"""
+    return send_from_directory('static', 'game.html')
+
+@static_pages_bp.route('/admin')
 def admin_panel():
     """Serve the admin panel (basic HTML interface)"""
     return send_from_directory('static', 'admin.html')
 
 # Static file routes
-@main_bp.route('/assets/<path:filename>')
+@static_pages_bp.route('/assets/<path:filename>')
 def assets(filename):
     """Serve static assets"""
     return send_from_directory('static/assets', filename)
 
-@main_bp.route('/favicon.ico')
+@static_pages_bp.route('/favicon.ico')
 def favicon():
     """Serve favicon"""
     return send_from_directory('static', 'favicon.ico')
 
-@main_bp.route('/ads.txt')
+@static_pages_bp.route('/ads.txt')
 def ads_txt():
     """Serve ads.txt file"""
     return send_from_directory('static', 'ads.txt')
 
-@main_bp.route('/robots.txt')
+@static_pages_bp.route('/robots.txt')
 def robots_txt():
     """Serve robots.txt file"""
     return send_from_directory('static', 'robots.txt')
 
-@main_bp.route('/sitemap.xml')
+@static_pages_bp.route('/sitemap.xml')
 def sitemap():
     """Serve sitemap.xml file"""
     return send_from_directory('static', 'sitemap.xml')
\ No newline at end of file
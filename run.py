@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """
 Production runner script for BTW Games Flask application
+
+Exposes `app` for gunicorn (see the Dockerfile); running this file directly
+starts Flask's threaded development server, which is for local use only.
 """
 
 from app import create_app
@@ -43,12 +43,17 @@ def create_categories():
         }
     ]
 
-    for cat_data in categories_data:
-        existing = Category.query.filter_by(slug=cat_data['slug']).first()
-        if not existing:
-            category = Category(**cat_data)
-            db.session.add(category)
-            print(f"Created category: {cat_data['name']}")
+    # One lookup for every slug instead of one per category
+    existing_slugs = {
+        row[0] for row in db.session.query(Category.slug).filter(
+            Category.slug.in_([cat_data['slug'] for cat_data in categories_data])
+        ).all()
+    }
+
+    new_categories = [cat_data for cat_data in categories_data if cat_data['slug'] not in existing_slugs]
+    db.session.bulk_insert_mappings(Category, new_categories)
+    for cat_data in new_categories:
+        print(f"Created category: {cat_data['name']}")
 
     db.session.commit()
 
@@ -56,11 +61,7 @@ def create_games():
     """Create initial games"""
 
     # Get categories
-    action_cat = Category.query.filter_by(slug='action').first()
-    puzzle_cat = Category.query.filter_by(slug='puzzle').first()
-    racing_cat = Category.query.filter_by(slug='racing').first()
-    strategy_cat = Category.query.filter_by(slug='strategy').first()
-    adventure_cat = Category.query.filter_by(slug='adventure').first()
+    category_ids = dict(db.session.query(Category.slug, Category.id).all())
 
     games_data = [
         {
@@ -70,7 +71,7 @@ def create_games():
             'long_description': 'Monster Survivors is an exhilarating browser-based survival game that puts you in the heart of relentless monster waves. As the last defender standing, you must use your wits, reflexes, and an arsenal of weapons to survive as long as possible against increasingly difficult enemies.',
             'thumbnail_url': 'https://btwgame.com/images/monster-survivors-thumb.jpg',
             'game_url': 'https://cloud.onlinegames.io/games/2025/unity/monster-survivors/index-og.html',
-            'category_id': action_cat.id,
+            'category_id': category_ids['action'],
             'rating': 4.5,
             'total_plays': 15420,
             'is_featured': True,
@@ -94,7 +95,7 @@ def create_games():
             'long_description': 'Puzzle Master offers a comprehensive collection of brain-teasing challenges designed to test your logical thinking and problem-solving skills. With over 500 unique puzzles across multiple difficulty levels.',
             'thumbnail_url': 'https://btwgame.com/images/puzzle-master-thumb.jpg',
             'game_url': 'https://example.com/puzzle-master',
-            'category_id': puzzle_cat.id,
+            'category_id': category_ids['puzzle'],
             'rating': 4.3,
             'total_plays': 8750,
             'is_featured': True,
@@ -116,7 +117,7 @@ def create_games():
             'long_description': 'Experience the thrill of high-speed racing with Racing Fever. Featuring stunning graphics, realistic physics, and multiple tracks, this game delivers an authentic racing experience.',
             'thumbnail_url': 'https://btwgame.com/images/racing-fever-thumb.jpg',
             'game_url': 'https://example.com/racing-fever',
-            'category_id': racing_cat.id,
+            'category_id': category_ids['racing'],
             'rating': 4.7,
             'total_plays': 22100,
             'is_featured': False,
@@ -138,7 +139,7 @@ def create_games():
             'long_description': 'Embark on an epic journey through space in Space Explorer. Discover new planets, encounter alien civilizations, and uncover the mysteries of the universe in this immersive space exploration game.',
             'thumbnail_url': 'https://btwgame.com/images/space-explorer-thumb.jpg',
             'game_url': 'https://example.com/space-explorer',
-            'category_id': adventure_cat.id,
+            'category_id': category_ids['adventure'],
             'rating': 4.4,
             'total_plays': 12300,
             'is_featured': False,
@@ -161,7 +162,7 @@ def create_games():
             'long_description': 'Tower Defense Pro challenges you to defend your base against endless waves of enemies using strategic tower placement and upgrades. Plan your defense carefully and utilize different tower types to succeed.',
             'thumbnail_url': 'https://btwgame.com/images/tower-defense-thumb.jpg',
             'game_url': 'https://example.com/tower-defense-pro',
-            'category_id': strategy_cat.id,
+            'category_id': category_ids['strategy'],
             'rating': 4.6,
             'total_plays': 18900,
             'is_featured': True,
@@ -183,7 +184,7 @@ def create_games():
             'long_description': 'Become a master ninja in this action-packed adventure. Use stealth, combat skills, and ancient weapons to complete challenging missions and defeat powerful enemies.',
             'thumbnail_url': 'https://btwgame.com/images/ninja-warrior-thumb.jpg',
             'game_url': 'https://example.com/ninja-warrior',
-            'category_id': action_cat.id,
+            'category_id': category_ids['action'],
             'rating': 4.2,
             'total_plays': 9800,
             'is_featured': False,
@@ -201,43 +202,54 @@ def create_games():
         }
     ]
 
-    for game_data in games_data:
-        existing = Game.query.filter_by(slug=game_data['slug']).first()
-        if not existing:
-            game = Game(**game_data)
-            db.session.add(game)
-            print(f"Created game: {game_data['title']}")
+    existing_slugs = {
+        row[0] for row in db.session.query(Game.slug).filter(
+            Game.slug.in_([game_data['slug'] for game_data in games_data])
+        ).all()
+    }
+
+    new_games = [game_data for game_data in games_data if game_data['slug'] not in existing_slugs]
+    db.session.bulk_insert_mappings(Game, new_games)
+    for game_data in new_games:
+        print(f"Created game: {game_data['title']}")
 
     db.session.commit()
 
 def create_sample_stats():
     """Create sample game statistics"""
-    games = Game.query.all()
+    games = db.session.query(Game.id, Game.total_plays).all()
+    today = date.today()
+
+    # Load every existing (game, date) pair for the window up front
+    existing_stats = set(
+        db.session.query(GameStats.game_id, GameStats.date).filter(
+            GameStats.game_id.in_([game.id for game in games]),
+            GameStats.date > today - timedelta(days=30)
+        ).all()
+    )
 
     # Create stats for the last 30 days
+    new_stats = []
     for i in range(30):
-        stat_date = date.today() - timedelta(days=i)
+        stat_date = today - timedelta(days=i)
 
         for game in games:
+            if (game.id, stat_date) in existing_stats:
+                continue
+
             # Generate random stats based on game popularity
-            base_plays = max(10, game.total_plays // 100)
+            base_plays = max(10, (game.total_plays or 0) // 100)
             daily_plays = max(1, base_plays + (i % 7) * 2)  # More plays on certain days
 
-            existing_stat = GameStats.query.filter_by(
-                game_id=game.id,
-                date=stat_date
-            ).first()
-
-            if not existing_stat:
-                game_stat = GameStats(
-                    game_id=game.id,
-                    date=stat_date,
-                    daily_plays=daily_plays,
-                    unique_players=max(1, daily_plays // 2),
-                    avg_play_duration=300 + (i % 10) * 30  # 5-10 minutes average
-                )
-                db.session.add(game_stat)
+            new_stats.append({
+                'game_id': game.id,
+                'date': stat_date,
+                'daily_plays': daily_plays,
+                'unique_players': max(1, daily_plays // 2),
+                'avg_play_duration': 300 + (i % 10) * 30  # 5-10 minutes average
+            })
 
+    db.session.bulk_insert_mappings(GameStats, new_stats)
     db.session.commit()
     print("Created sample game statistics")
 
@@ -12,6 +12,7 @@ Usage:
 Features:
 - Serves all files from static_html directory
 - Automatic MIME type detection
+- Gzip compression for text assets
 - Custom 404 page handling
 - CORS headers for development
 - Hot reload capability
@@ -21,7 +22,6 @@ Features:
 """
 
 import http.server
-import socketserver
 import os
 import sys
 import argparse
@@ -30,13 +30,19 @@ import webbrowser
 import threading
 import time
 import subprocess
+import stat
+import gzip
+import io
+import posixpath
+from functools import lru_cache
+from pathlib import PurePosixPath
 from urllib.parse import urlparse, unquote
-import mimetypes
 
 API_PROXY_HOST = os.environ.get('API_PROXY_HOST', 'localhost')
 API_PROXY_PORT = int(os.environ.get('API_PROXY_PORT', '5001'))
 PROXY_SKIP_HEADERS = {
     'connection',
+    'content-length',
     'keep-alive',
     'proxy-authenticate',
     'proxy-authorization',
@@ -54,14 +60,165 @@ PROXY_SKIP_HEADERS = {
     'expires',
 }
 
-class ThreadingReusableTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+# Extension lookup for the file types the static site actually ships;
+# anything else falls back to mimetypes via SimpleHTTPRequestHandler
+MIME_TYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.js': 'application/javascript',
+    '.css': 'text/css',
+    '.json': 'application/json',
+    '.txt': 'text/plain; charset=utf-8',
+    '.xml': 'application/xml',
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.webp': 'image/webp',
+    '.gif': 'image/gif',
+    '.svg': 'image/svg+xml',
+    '.ico': 'image/x-icon',
+    '.woff2': 'font/woff2',
+}
+
+# Text types worth compressing, mirroring gzip_types in nginx.conf
+GZIP_TYPES = {
+    'text/html',
+    'text/css',
+    'text/plain',
+    'application/javascript',
+    'application/json',
+    'application/xml',
+    'image/svg+xml',
+}
+GZIP_MIN_SIZE = 1024
+
+NOT_FOUND_HTML = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>404 - Page Not Found | BTW game</title>
+    <style>
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            margin: 0;
+            padding: 0;
+            min-height: 100vh;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            color: white;
+        }
+        .container {
+            text-align: center;
+            max-width: 600px;
+            padding: 2rem;
+        }
+        .error-code {
+            font-size: 8rem;
+            font-weight: bold;
+            margin: 0;
+            opacity: 0.8;
+        }
+        .error-message {
+            font-size: 1.5rem;
+            margin: 1rem 0;
+        }
+        .error-description {
+            font-size: 1rem;
+            opacity: 0.8;
+            margin-bottom: 2rem;
+        }
+        .btn {
+            display: inline-block;
+            padding: 12px 24px;
+            background: rgba(255, 255, 255, 0.2);
+            color: white;
+            text-decoration: none;
+            border-radius: 8px;
+            border: 2px solid rgba(255, 255, 255, 0.3);
+            transition: all 0.3s ease;
+            margin: 0 0.5rem;
+        }
+        .btn:hover {
+            background: rgba(255, 255, 255, 0.3);
+            border-color: rgba(255, 255, 255, 0.5);
+        }
+        .game-icon {
+            font-size: 4rem;
+            margin-bottom: 1rem;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="game-icon">🎮</div>
+        <h1 class="error-code">404</h1>
+        <h2 class="error-message">Oops! Game Not Found</h2>
+        <p class="error-description">
+            The page or game you're looking for doesn't exist.
+            Maybe it's time to discover a new adventure?
+        </p>
+        <a href="/" class="btn">🏠 Back to Home</a>
+        <a href="/games" class="btn">🎯 Browse All Games</a>
+    </div>
+</body>
+</html>
+"""
+
+# Encoded once at import instead of on every miss
+NOT_FOUND_BODY = NOT_FOUND_HTML.encode('utf-8')
+
+@lru_cache(maxsize=2048)
+def stat_for_second(full_path, second):
+    """os.stat() result for a path, or None if it is missing; cached per wall-clock second."""
+    try:
+        return os.stat(full_path)
+    except (OSError, ValueError):
+        return None
+
+def cached_stat(full_path):
+    """Stat a path, reusing the result for up to a second so repeated asset hits skip the syscall."""
+    return stat_for_second(full_path, int(time.time()))
+
+def is_within_static_root(full_path):
+    """Check that a path, with symlinks resolved, stays inside static_html."""
+    root = os.path.realpath("static_html")
+    try:
+        return os.path.commonpath([os.path.realpath(full_path), root]) == root
+    except ValueError:
+        # Embedded NUL byte; no such file can exist
+        return False
+
+@lru_cache(maxsize=256)
+def gzip_for_mtime(full_path, mtime_ns):
+    """Gzipped bytes of a file; keyed on mtime so an edited file is compressed again on its next request."""
+    with open(full_path, 'rb') as f:
+        return gzip.compress(f.read(), compresslevel=6, mtime=0)
+
+@lru_cache(maxsize=1)
+def log_timestamp(second):
+    """Formatted local time for a wall-clock second; requests within the same second reuse it."""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(second))
+
+class ThreadingReusableHTTPServer(http.server.ThreadingHTTPServer):
     """Threaded local server so one slow browser connection cannot block all requests."""
     allow_reuse_address = True
     daemon_threads = True
+    # Room for a burst of parallel asset requests before the kernel refuses connections
+    request_queue_size = 128
 
 class StaticHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     """Custom HTTP request handler for static files"""
 
+    # Keep-alive lets the browser reuse a connection for every asset on a page;
+    # each response must therefore carry a Content-Length (or have no body)
+    protocol_version = 'HTTP/1.1'
+
+    # Socket timeout so a stalled or idle client cannot pin a worker thread forever
+    timeout = 30
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory="static_html", **kwargs)
 
@@ -70,87 +227,155 @@ class StaticHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
+        # no-cache (not no-store) so browsers keep a copy and revalidate it with If-None-Match
+        self.send_header('Cache-Control', 'no-cache, must-revalidate')
         self.send_header('Pragma', 'no-cache')
         self.send_header('Expires', '0')
         super().end_headers()
 
-    def do_GET(self):
-        """Handle GET requests with custom routing"""
-        self.serve_static_request(include_body=True)
-
-    def do_HEAD(self):
-        """Handle HEAD requests with the same routing as GET."""
-        self.serve_static_request(include_body=False)
+    def send_head(self):
+        """Apply clean URL routing, then send the file headers and return the body to copy.
 
-    def serve_static_request(self, include_body=True):
-        """Serve static files with clean URL routing."""
+        Conditional requests are answered from the ETag (If-None-Match);
+        do_GET and do_HEAD come from SimpleHTTPRequestHandler.
+        """
         parsed_path = urlparse(self.path)
 
         if parsed_path.path.startswith('/api/'):
             self.proxy_api_request()
-            return
+            return None
 
         clean_url = self.get_clean_url_redirect(parsed_path)
         if clean_url:
             self.send_response(308)
             self.send_header('Location', clean_url)
+            self.send_header('Content-Length', '0')
             self.end_headers()
-            return
+            return None
 
-        path = unquote(parsed_path.path)
+        resolved = self.resolve_static_path(unquote(parsed_path.path))
+        if resolved is None:
+            # Send 404 with custom page
+            self.send_404()
+            return None
+        path, st = resolved
+
+        content_type = self.guess_type(path)
+        vary_encoding = content_type.split(';')[0] in GZIP_TYPES and st.st_size >= GZIP_MIN_SIZE
+        use_gzip = vary_encoding and self.accepts_gzip()
+
+        # ETag from file metadata only, so unchanged files are answered without reading them
+        etag = f'"{st.st_ino:x}-{st.st_size:x}-{st.st_mtime_ns:x}{"-gz" if use_gzip else ""}"'
+        if self.etag_matches(etag):
+            self.send_response(304)
+            self.send_validators(etag, vary_encoding)
+            self.end_headers()
+            return None
 
-        # Remove leading slash for file system
-        if path.startswith('/'):
-            path = path[1:]
+        if use_gzip:
+            return self.send_gzip_head(path, st, content_type, etag)
+        return self.send_file_head(path, content_type, etag, vary_encoding)
 
-        # Default to index.html for root
-        if path == '' or path == '/':
-            path = 'index.html'
+    def send_validators(self, etag, vary_encoding):
+        """Send the ETag, plus Vary when the response could also have been gzipped."""
+        self.send_header('ETag', etag)
+        if vary_encoding:
+            self.send_header('Vary', 'Accept-Encoding')
 
-        # Construct full file path. Prefer same-name .html files for clean
-        # URLs so /games maps to games.html even though /games/ is also the
-        # directory that stores individual game pages.
-        full_path = os.path.join("static_html", path)
+    def send_file_head(self, path, content_type, etag, vary_encoding):
+        """Send headers for a file as stored on disk and return the open file."""
+        try:
+            f = open(os.path.join("static_html", path), 'rb')
+        except OSError:
+            # Removed since it was resolved
+            self.send_404()
+            return None
+        fs = os.fstat(f.fileno())
+        self.send_response(200)
+        self.send_header('Content-type', content_type)
+        self.send_header('Content-Length', str(fs.st_size))
+        self.send_header('Last-Modified', self.date_time_string(fs.st_mtime))
+        self.send_validators(etag, vary_encoding)
+        self.end_headers()
+        return f
+
+    def send_gzip_head(self, path, st, content_type, etag):
+        """Send headers for the gzipped variant of a file and return its body."""
+        body = gzip_for_mtime(os.path.join("static_html", path), st.st_mtime_ns)
+        self.send_response(200)
+        self.send_header('Content-type', content_type)
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Last-Modified', self.date_time_string(st.st_mtime))
+        self.send_validators(etag, True)
+        self.end_headers()
+        return io.BytesIO(body)
+
+    def accepts_gzip(self):
+        """Check whether the request's Accept-Encoding allows gzip."""
+        for coding in self.headers.get('Accept-Encoding', '').split(','):
+            name, _, params = coding.partition(';')
+            if name.strip().lower() != 'gzip':
+                continue
+            quality = params.strip().removeprefix('q=')
+            try:
+                return not quality or float(quality) > 0
+            except ValueError:
+                return True
+        return False
 
-        if not os.path.splitext(path)[1]:
-            html_path = os.path.join("static_html", f"{path}.html")
-            if os.path.isfile(html_path):
-                full_path = html_path
-                path = f"{path}.html"
-
-        if os.path.isdir(full_path):
-            full_path = os.path.join(full_path, 'index.html')
-            path = os.path.join(path, 'index.html')
-
-        # Check if file exists
-        if os.path.isfile(full_path):
-            # Determine MIME type
-            mime_type, _ = mimetypes.guess_type(full_path)
-            if mime_type is None:
-                if path.endswith('.html'):
-                    mime_type = 'text/html'
-                elif path.endswith('.js'):
-                    mime_type = 'application/javascript'
-                elif path.endswith('.css'):
-                    mime_type = 'text/css'
-                elif path.endswith('.json'):
-                    mime_type = 'application/json'
-                else:
-                    mime_type = 'application/octet-stream'
-
-            # Send response
-            self.send_response(200)
-            self.send_header('Content-type', mime_type)
-            self.end_headers()
+    def guess_type(self, path):
+        """Resolve the MIME type with one dict lookup on the extension."""
+        mime_type = MIME_TYPES.get(os.path.splitext(path)[1].lower())
+        if mime_type:
+            return mime_type
+        return super().guess_type(path)
+
+    def etag_matches(self, etag):
+        """Check the request's If-None-Match header against an ETag."""
+        if_none_match = self.headers.get('If-None-Match')
+        if not if_none_match:
+            return False
+        candidates = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+        return '*' in candidates or etag in candidates
+
+    def resolve_static_path(self, path):
+        """Map a request path to (path, stat) for a file under static_html, or None if there is no such file."""
+        # Normalise once: drops the leading root plus empty and '.' segments.
+        # A '//' root (e.g. from /%2Fetc/passwd) is kept as a part and would
+        # make os.path.join discard static_html, so refuse it along with '..'
+        parts = list(PurePosixPath(path).parts)
+        if parts and parts[0] == '/':
+            parts = parts[1:]
+        if any(part == '..' or part.startswith('/') for part in parts):
+            return None
+
+        # Default to index.html for root
+        path = '/'.join(parts) or 'index.html'
 
-            # Read and send file content
-            if include_body:
-                with open(full_path, 'rb') as f:
-                    self.wfile.write(f.read())
+        # Prefer same-name .html files for clean URLs so /games maps to
+        # games.html even though /games/ is also the directory that stores
+        # individual game pages.
+        candidates = [path, posixpath.join(path, 'index.html')]
+        if not os.path.splitext(path)[1]:
+            candidates.insert(0, f"{path}.html")
+
+        for candidate in candidates:
+            full_path = os.path.join("static_html", candidate)
+            if not is_within_static_root(full_path):
+                continue
+            st = cached_stat(full_path)
+            if st and stat.S_ISREG(st.st_mode):
+                return candidate, st
+        return None
+
+    def copyfile(self, source, outputfile):
+        """Send file bodies with socket.sendfile(), which uses the kernel's zero-copy sendfile(2) where available."""
+        if outputfile is self.wfile:
+            self.wfile.flush()
+            self.connection.sendfile(source)
         else:
-            # Send 404 with custom page
-            self.send_404()
+            super().copyfile(source, outputfile)
 
     def get_clean_url_redirect(self, parsed_path):
         """Return clean URL target for legacy .html paths."""
@@ -190,6 +415,10 @@ class StaticHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
             self.proxy_api_request()
             return
 
+        # Drain the body so it is not read as the next request on this connection
+        content_length = int(self.headers.get('Content-Length', 0))
+        if content_length:
+            self.rfile.read(content_length)
         self.send_404()
 
     def do_OPTIONS(self):
@@ -222,14 +451,22 @@ class StaticHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
                 if header.lower() in PROXY_SKIP_HEADERS:
                     continue
                 self.send_header(header, value)
+            # HEAD has no body to measure, so pass on the length the upstream GET would have
+            if self.command == 'HEAD':
+                self.send_header('Content-Length', response.getheader('Content-Length', '0'))
+            else:
+                self.send_header('Content-Length', str(len(response_body)))
             self.end_headers()
             self.wfile.write(response_body)
         except Exception as error:
+            message = f'{{"error":"API proxy failed","detail":"{str(error)}"}}'.encode('utf-8')
             self.send_response(502)
             self.send_header('Content-type', 'application/json')
+            self.send_header('Content-Length', str(len(message)))
             self.end_headers()
-            message = f'{{"error":"API proxy failed","detail":"{str(error)}"}}'
-            self.wfile.write(message.encode('utf-8'))
+            # On a keep-alive connection a HEAD body would be read as the next response
+            if self.command != 'HEAD':
+                self.wfile.write(message)
         finally:
             try:
                 connection.close()
@@ -239,90 +476,16 @@ class StaticHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     def send_404(self):
         """Send custom 404 page"""
         self.send_response(404)
-        self.send_header('Content-type', 'text/html')
+        self.send_header('Content-type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(NOT_FOUND_BODY)))
         self.end_headers()
 
-        html_content = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>404 - Page Not Found | BTW game</title>
-    <style>
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            margin: 0;
-            padding: 0;
-            min-height: 100vh;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            color: white;
-        }
-        .container {
-            text-align: center;
-            max-width: 600px;
-            padding: 2rem;
-        }
-        .error-code {
-            font-size: 8rem;
-            font-weight: bold;
-            margin: 0;
-            opacity: 0.8;
-        }
-        .error-message {
-            font-size: 1.5rem;
-            margin: 1rem 0;
-        }
-        .error-description {
-            font-size: 1rem;
-            opacity: 0.8;
-            margin-bottom: 2rem;
-        }
-        .btn {
-            display: inline-block;
-            padding: 12px 24px;
-            background: rgba(255, 255, 255, 0.2);
-            color: white;
-            text-decoration: none;
-            border-radius: 8px;
-            border: 2px solid rgba(255, 255, 255, 0.3);
-            transition: all 0.3s ease;
-            margin: 0 0.5rem;
-        }
-        .btn:hover {
-            background: rgba(255, 255, 255, 0.3);
-            border-color: rgba(255, 255, 255, 0.5);
-        }
-        .game-icon {
-            font-size: 4rem;
-            margin-bottom: 1rem;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="game-icon">🎮</div>
-        <h1 class="error-code">404</h1>
-        <h2 class="error-message">Oops! Game Not Found</h2>
-        <p class="error-description">
-            The page or game you're looking for doesn't exist.
-            Maybe it's time to discover a new adventure?
-        </p>
-        <a href="/" class="btn">🏠 Back to Home</a>
-        <a href="/games" class="btn">🎯 Browse All Games</a>
-    </div>
-</body>
-</html>
-        """
-        self.wfile.write(html_content.encode('utf-8'))
+        if self.command != 'HEAD':
+            self.wfile.write(NOT_FOUND_BODY)
 
     def log_message(self, format, *args):
         """Custom log format"""
-        timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
-        print(f"[{timestamp}] {format % args}")
+        print(f"[{log_timestamp(int(time.time()))}] {format % args}")
 
 def check_static_directory():
     """Check if static_html directory exists"""
@@ -470,7 +633,7 @@ Examples:
 
     try:
         # Create server
-        with ThreadingReusableTCPServer((args.host, args.port), StaticHTTPRequestHandler) as httpd:
+        with ThreadingReusableHTTPServer((args.host, args.port), StaticHTTPRequestHandler) as httpd:
             print(f"✅ Server started successfully!")
 
             # Open browser if requested
@@ -6,6 +6,8 @@ Show games statistics after import
 
 from app import create_app
 from models import Game, Category, db
+from sqlalchemy import func, and_
+from sqlalchemy.orm import joinedload
 
 def show_games_stats():
     app = create_app()
@@ -13,9 +15,21 @@ def show_games_stats():
     with app.app_context():
         print("=== BTW Games Database Statistics ===\n")
 
-        # Total counts
-        total_games = Game.query.filter(Game.is_active == True).count()
-        total_categories = Category.query.count()
+        # Total counts; COUNT(column) skips NULLs, so one pass covers iframe/thumbnail coverage too
+        total_games, games_with_iframe, games_with_thumbnails = db.session.query(
+            func.count(Game.id),
+            func.count(Game.iframe_url),
+            func.count(Game.thumbnail_url)
+        ).filter(Game.is_active == True).one()
+
+        # Active games per category in a single GROUP BY
+        category_counts = db.session.query(
+            Category.name,
+            func.count(Game.id)
+        ).outerjoin(
+            Game, and_(Game.category_id == Category.id, Game.is_active == True)
+        ).group_by(Category.id, Category.name).order_by(Category.id).all()
+        total_categories = len(category_counts)
 
         print(f"📊 Total Games: {total_games}")
         print(f"📂 Total Categories: {total_categories}")
@@ -23,16 +37,17 @@ def show_games_stats():
 
         # Games by category
         print("🎯 Games by Category:")
-        categories = Category.query.all()
-        for category in categories:
-            game_count = Game.query.filter_by(category_id=category.id, is_active=True).count()
-            print(f"   {category.name}: {game_count} games")
+        for category_name, game_count in category_counts:
+            print(f"   {category_name}: {game_count} games")
 
         print()
 
         # Recently added games
         print("🆕 Recently Added Games (last 10):")
-        recent_games = Game.query.filter(Game.is_active == True).order_by(Game.created_at.desc()).limit(10).all()
+        # Load each game's category in the same query so category_name doesn't lazy-load per row
+        recent_games = Game.query.options(
+            joinedload(Game.category_obj)
+        ).filter(Game.is_active == True).order_by(Game.created_at.desc()).limit(10).all()
 
         for i, game in enumerate(recent_games, 1):
             iframe_status = "✅" if game.iframe_url else "❌"
@@ -44,10 +59,6 @@ def show_games_stats():
 
         print()
 
-        # Games with iframe URLs
-        games_with_iframe = Game.query.filter(Game.iframe_url.isnot(None), Game.is_active == True).count()
-        games_with_thumbnails = Game.query.filter(Game.thumbnail_url.isnot(None), Game.is_active == True).count()
-
         print("📈 Content Completeness:")
         print(f"   Games with iframe URLs: {games_with_iframe}/{total_games} ({games_with_iframe/total_games*100:.1f}%)")
         print(f"   Games with thumbnails: {games_with_thumbnails}/{total_games} ({games_with_thumbnails/total_games*100:.1f}%)")
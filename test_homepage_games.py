@@ -6,8 +6,10 @@ Test homepage games display and links
 
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
 from app import create_app
-from models import Game
+from models import Game, db
+from sqlalchemy import func
 
 def test_homepage_games():
     """Test that homepage displays games with correct links and thumbnails"""
@@ -23,12 +25,25 @@ def test_homepage_games():
             # Test API endpoints used by homepage
             print("📡 Testing API endpoints...")
 
+            test_games = ['monster-survivors', 'papas-donuteria', 'geometry-dash']
+
+            # Issue every probe at once over one pooled session
+            with requests.Session() as session, ThreadPoolExecutor(max_workers=len(test_games) + 2) as executor:
+                new_games_future = executor.submit(session.get, f"{base_url}/api/games?new=true&per_page=6&sort=newest")
+                popular_games_future = executor.submit(session.get, f"{base_url}/api/games?per_page=6&sort=popular")
+                game_futures = [
+                    (slug, executor.submit(session.head, f"{base_url}/games/{slug}"))
+                    for slug in test_games
+                ]
+
+                new_games_response = new_games_future.result()
+                popular_games_response = popular_games_future.result()
+                game_responses = [(slug, future.result()) for slug, future in game_futures]
+
             # Test new games endpoint
-            new_games_response = requests.get(f"{base_url}/api/games?new=true&per_page=6&sort=newest")
             print(f"New games API: {new_games_response.status_code}")
 
             # Test popular games endpoint
-            popular_games_response = requests.get(f"{base_url}/api/games?per_page=6&sort=popular")
             print(f"Popular games API: {popular_games_response.status_code}")
 
             if new_games_response.status_code == 200:
@@ -63,20 +78,17 @@ def test_homepage_games():
 
             # Test some individual game pages
             print(f"\n🎮 Testing Individual Game Pages:")
-            test_games = ['monster-survivors', 'papas-donuteria', 'geometry-dash']
-
-            for slug in test_games:
-                game_response = requests.head(f"{base_url}/games/{slug}")
+            for slug, game_response in game_responses:
                 status = "✅" if game_response.status_code == 200 else "❌"
                 print(f"   /games/{slug}: {status} ({game_response.status_code})")
 
             # Count games with/without thumbnails
             print(f"\n📊 Database Statistics:")
-            total_games = Game.query.filter(Game.is_active == True).count()
-            games_with_thumbnails = Game.query.filter(
-                Game.thumbnail_url.isnot(None),
-                Game.is_active == True
-            ).count()
+            # COUNT(column) skips NULLs, so one pass gives both totals
+            total_games, games_with_thumbnails = db.session.query(
+                func.count(Game.id),
+                func.count(Game.thumbnail_url)
+            ).filter(Game.is_active == True).one()
 
             print(f"   Total active games: {total_games}")
             print(f"   Games with thumbnails: {games_with_thumbnails}")
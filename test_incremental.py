@@ -28,7 +28,7 @@ def test_incremental_addition():
     # Test the deduplication logic
     test_game = {
         'title': 'Test Game',
-        'url': list(existing_urls)[0] if existing_urls else 'https://example.com/new-game',
+        'url': next(iter(existing_urls)) if existing_urls else 'https://example.com/new-game',
         'description': 'Test description',
         'iframes': []
     }
@@ -38,15 +38,12 @@ def test_incremental_addition():
     # Simulate adding this game
     extractor.game_data['games'] = [test_game]
 
-    # Test save functionality (dry run)
-    existing_games_before = extractor.load_existing_games('games_data.json')
-    existing_urls_before = extractor.get_existing_game_urls(existing_games_before)
-
+    # Test save functionality (dry run) against the URLs loaded above
     new_games = []
     skipped_count = 0
 
     for game in extractor.game_data['games']:
-        if game['url'] not in existing_urls_before:
+        if game['url'] not in existing_urls:
             new_games.append(game)
             print(f"  ✅ Would add new game: {game['title']}")
         else:
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+"""
+Test that API endpoints stay within their SQL query budgets
+"""
+
+import os
+from app import create_app
+from models import Category
+
+# Upper bound on SQL statements per endpoint; raise deliberately, never to silence a new N+1
+QUERY_BUDGETS = {
+    '/api/games?per_page=20': 4,
+    '/api/games?per_page=20&sort=newest': 4,
+    '/api/search?q=game&per_page=20': 4,
+    '/api/stats/games': 5,
+    '/api/games/exists?slugs=monster-survivors,geometry-dash,papas-donuteria': 1,
+}
+
+def test_query_counts():
+    """Test that list and stats endpoints don't scale queries with the number of games"""
+
+    os.environ['TRACK_QUERY_COUNT'] = '1'
+    app = create_app()
+
+    with app.app_context():
+        print("=== Testing API Query Counts ===\n")
+
+        budgets = dict(QUERY_BUDGETS)
+        category = Category.query.first()
+        if category:
+            budgets[f'/api/categories/{category.id}/games?per_page=20'] = 5
+            budgets[f'/api/games?per_page=20&category={category.slug}'] = 4
+            budgets[f'/api/search?q=game&per_page=20&category={category.slug}'] = 4
+
+    client = app.test_client()
+    failures = []
+
+    for url, budget in budgets.items():
+        response = client.get(url)
+        query_count = int(response.headers.get('X-Query-Count', 0))
+        within_budget = response.status_code == 200 and query_count <= budget
+        status = "✅" if within_budget else "❌"
+        print(f"   {url}: {status} {query_count}/{budget} queries ({response.status_code})")
+        if not within_budget:
+            failures.append(url)
+
+    assert not failures, f"Query budget exceeded for: {', '.join(failures)}"
+    print("\n✅ Query count testing completed!")
+
+if __name__ == '__main__':
+    test_query_counts()
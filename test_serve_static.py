@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+"""
+Test that the static dev server never serves files outside static_html
+and keeps keep-alive connections in sync
+"""
+
+import os
+import socket
+import http.client
+import threading
+import serve_static
+from serve_static import ThreadingReusableHTTPServer, StaticHTTPRequestHandler
+
+# Paths that try to escape static_html through an encoded slash, a double slash or '..', or carry a NUL byte
+TRAVERSAL_PATHS = [
+    '/%2Fetc/passwd',
+    '/%2F%2Fetc/passwd',
+    '//etc/passwd',
+    '/games/%2Fetc/passwd',
+    '/..%2F..%2Fetc/passwd',
+    '/%2E%2E/%2E%2E/etc/passwd',
+    '/%00',
+]
+
+def test_static_path_traversal():
+    """Test that traversal attempts get a 404 while normal pages are still served"""
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    StaticHTTPRequestHandler.log_message = lambda self, format, *args: None
+
+    with ThreadingReusableHTTPServer(('127.0.0.1', 0), StaticHTTPRequestHandler) as httpd:
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        try:
+            print("=== Testing Static Path Traversal ===\n")
+
+            failures = []
+            for path, expected in [('/', 200)] + [(path, 404) for path in TRAVERSAL_PATHS]:
+                conn = http.client.HTTPConnection('127.0.0.1', httpd.server_address[1], timeout=10)
+                conn.request('GET', path)
+                response = conn.getresponse()
+                body = response.read()
+                conn.close()
+
+                ok = response.status == expected and b'root:' not in body
+                status = "✅" if ok else "❌"
+                print(f"   {path}: {status} {response.status} (expected {expected})")
+                if not ok:
+                    failures.append(path)
+        finally:
+            httpd.shutdown()
+
+    assert not failures, f"Unexpected responses for: {', '.join(failures)}"
+    print("\n✅ Static path traversal testing completed!")
+
+def test_api_proxy_head_keep_alive():
+    """Test that a failed HEAD proxy sends no body, so the next request on the connection still parses"""
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    StaticHTTPRequestHandler.log_message = lambda self, format, *args: None
+
+    # Point the proxy at a port nothing listens on, so every /api request fails with 502
+    proxy_port = serve_static.API_PROXY_PORT
+    with socket.socket() as unused:
+        unused.bind(('127.0.0.1', 0))
+        serve_static.API_PROXY_PORT = unused.getsockname()[1]
+
+    with ThreadingReusableHTTPServer(('127.0.0.1', 0), StaticHTTPRequestHandler) as httpd:
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        try:
+            print("=== Testing API Proxy HEAD Keep-Alive ===\n")
+
+            conn = http.client.HTTPConnection('127.0.0.1', httpd.server_address[1], timeout=10)
+            conn.request('HEAD', '/api/games')
+            head = conn.getresponse()
+            head.read()
+            print(f"   HEAD /api/games: {head.status}")
+
+            # Same connection: a stray HEAD body would surface here as a BadStatusLine
+            conn.request('GET', '/')
+            response = conn.getresponse()
+            response.read()
+            conn.close()
+            print(f"   GET /: {response.status}")
+        finally:
+            httpd.shutdown()
+            serve_static.API_PROXY_PORT = proxy_port
+
+    assert head.status == 502, f"Expected 502 from the failed proxy, got {head.status}"
+    assert response.status == 200, f"Expected 200 after the HEAD, got {response.status}"
+    print("\n✅ API proxy keep-alive testing completed!")
+
+if __name__ == '__main__':
+    test_static_path_traversal()
+    test_api_proxy_head_keep_alive()
@@ -5,8 +5,10 @@ Test thumbnail display logic - ensure placeholders only show when no real thumbn
 """
 
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from app import create_app
-from models import Game
+from models import Game, db
+from sqlalchemy import func
 
 def test_thumbnail_logic():
     """Test that thumbnails are displayed correctly and placeholders only show when needed"""
@@ -38,9 +40,20 @@ def test_thumbnail_logic():
             # Test API data structure
             print("\n📡 Testing API responses...")
 
-            # Test homepage API calls
-            new_games_response = requests.get(f"{base_url}/api/games?new=true&per_page=3&sort=newest")
-            popular_games_response = requests.get(f"{base_url}/api/games?per_page=3&sort=popular")
+            test_games = ['papas-donuteria', 'geometry-dash', 'monster-survivors']
+
+            # Issue the homepage API calls and game page checks at once over one pooled session
+            with requests.Session() as session, ThreadPoolExecutor(max_workers=len(test_games) + 2) as executor:
+                new_games_future = executor.submit(session.get, f"{base_url}/api/games?new=true&per_page=3&sort=newest")
+                popular_games_future = executor.submit(session.get, f"{base_url}/api/games?per_page=3&sort=popular")
+                game_futures = [
+                    (slug, executor.submit(session.head, f"{base_url}/games/{slug}"))
+                    for slug in test_games
+                ]
+
+                new_games_response = new_games_future.result()
+                popular_games_response = popular_games_future.result()
+                game_responses = [(slug, future.result()) for slug, future in game_futures]
 
             if new_games_response.status_code == 200:
                 new_games = new_games_response.json()['games']
@@ -60,11 +73,8 @@ def test_thumbnail_logic():
 
             # Test individual game pages
             print(f"\n🎮 Testing Individual Game Pages:")
-            test_games = ['papas-donuteria', 'geometry-dash', 'monster-survivors']
-
-            for slug in test_games:
+            for slug, game_response in game_responses:
                 # Test game page response
-                game_response = requests.head(f"{base_url}/games/{slug}")
                 status = "✅" if game_response.status_code == 200 else "❌"
 
                 # Get game data to check thumbnail
@@ -75,11 +85,11 @@ def test_thumbnail_logic():
                     print(f"   /games/{slug}: {status} | {thumbnail_status}")
 
             # Summary
-            total_games = Game.query.filter(Game.is_active == True).count()
-            games_with_thumbs = Game.query.filter(
-                Game.thumbnail_url.isnot(None),
-                Game.is_active == True
-            ).count()
+            # COUNT(column) skips NULLs, so one pass gives both totals
+            total_games, games_with_thumbs = db.session.query(
+                func.count(Game.id),
+                func.count(Game.thumbnail_url)
+            ).filter(Game.is_active == True).one()
 
             print(f"\n📈 Summary:")
             print(f"   Total active games: {total_games}")
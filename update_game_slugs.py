@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
-import json
+import orjson
 
 def update_game_slugs():
     # Read updated games data
-    with open('static_html/all_games.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    with open('static_html/all_games.json', 'rb') as f:
+        data = orjson.loads(f.read())
 
     # Extract games array from the data structure
     games = data.get('games', []) if isinstance(data, dict) else data
@@ -14,8 +14,7 @@ def update_game_slugs():
 
     # Write updated slugs to file
     with open('static_html/game_slugs.txt', 'w', encoding='utf-8') as f:
-        for slug in slugs:
-            f.write(slug + '\n')
+        f.write(''.join(f"{slug}\n" for slug in slugs))
 
     print(f"Updated game_slugs.txt with {len(slugs)} game slugs")
 
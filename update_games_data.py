@@ -1,46 +1,50 @@
 #!/usr/bin/env python3
-import json
 import random
+import sys
+import orjson
 
-def update_games_data():
+def update_games_data(seed=None):
     # Read current games data
-    with open('static_html/all_games.json', 'r', encoding='utf-8') as f:
-        games = json.load(f)
+    with open('static_html/all_games.json', 'rb') as f:
+        games = orjson.loads(f.read())
 
     print(f"Original games count: {len(games)}")
 
     # Remove example games (games with example.com iframe_url)
-    real_games = [game for game in games if 'example.com' not in game.get('iframe_url', '')]
-
-    print(f"Games after removing examples: {len(real_games)}")
-    print("Removed games:")
+    real_games = []
+    removed_games = []
     for game in games:
         if 'example.com' in game.get('iframe_url', ''):
-            print(f"  - {game['title']} ({game['slug']})")
+            removed_games.append(game)
+        else:
+            real_games.append(game)
 
-    # Reset all isNew flags to False first
-    for game in real_games:
-        game['isNew'] = False
+    print(f"Games after removing examples: {len(real_games)}")
+    print("Removed games:")
+    sys.stdout.write(''.join(f"  - {game['title']} ({game['slug']})\n" for game in removed_games))
 
-    # Randomly select 8-12 games to mark as new
-    num_new_games = random.randint(8, 12)
-    new_games = random.sample(real_games, min(num_new_games, len(real_games)))
+    # Randomly select 8-12 games to mark as new; pass a seed for a repeatable pick
+    rng = random.Random(seed)
+    num_new_games = rng.randint(8, 12)
+    new_indices = frozenset(rng.sample(range(len(real_games)), min(num_new_games, len(real_games))))
 
-    for game in new_games:
-        game['isNew'] = True
+    # Set every isNew flag and collect the new games, in catalog order, in one pass
+    new_games_only = []
+    for index, game in enumerate(real_games):
+        game['isNew'] = index in new_indices
+        if game['isNew']:
+            new_games_only.append(game)
 
-    print(f"\nMarked {len(new_games)} games as NEW:")
-    for game in new_games:
-        print(f"  - {game['title']} ({game['slug']})")
+    print(f"\nMarked {len(new_games_only)} games as NEW:")
+    sys.stdout.write(''.join(f"  - {game['title']} ({game['slug']})\n" for game in new_games_only))
 
     # Write updated data back
-    with open('static_html/all_games.json', 'w', encoding='utf-8') as f:
-        json.dump(real_games, f, indent=2, ensure_ascii=False)
+    with open('static_html/all_games.json', 'wb') as f:
+        f.write(orjson.dumps(real_games, option=orjson.OPT_INDENT_2))
 
     # Update new_games.json file
-    new_games_only = [game for game in real_games if game['isNew']]
-    with open('static_html/new_games.json', 'w', encoding='utf-8') as f:
-        json.dump(new_games_only, f, indent=2, ensure_ascii=False)
+    with open('static_html/new_games.json', 'wb') as f:
+        f.write(orjson.dumps(new_games_only, option=orjson.OPT_INDENT_2))
 
     print(f"\nUpdated files:")
     print(f"  - all_games.json: {len(real_games)} games")
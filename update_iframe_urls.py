@@ -4,29 +4,49 @@
 Script to add iframe_url to existing games
 """
 
+import sys
 from app import create_app
 from models import Game, db
+from sqlalchemy import update, or_
+
+MONSTER_SURVIVORS_IFRAME_URL = 'https://cloud.onlinegames.io/games/2025/unity/monster-survivors/index-og.html'
 
 def update_games_with_iframe_urls():
     app = create_app()
 
     with app.app_context():
-        # Get all games
-        games = Game.query.all()
+        # Only the columns needed for reporting; the writes happen in bulk below
+        games = db.session.query(Game.id, Game.title, Game.slug, Game.game_url, Game.iframe_url).all()
 
+        # Collect the per-game report and write it in one go
+        lines = []
         for game in games:
-            print(f"Updating game: {game.title} (ID: {game.id}, Slug: {game.slug})")
+            lines.append(f"Updating game: {game.title} (ID: {game.id}, Slug: {game.slug})")
 
-            # For now, set iframe_url to be the same as game_url
-            # In a real scenario, you would have specific iframe URLs
             if game.game_url and not game.iframe_url:
-                game.iframe_url = game.game_url
-                print(f"  Set iframe_url to: {game.iframe_url}")
+                lines.append(f"  Set iframe_url to: {game.game_url}")
 
-            # Special case for Monster Survivors
             if game.slug == 'monster-survivors':
-                game.iframe_url = 'https://cloud.onlinegames.io/games/2025/unity/monster-survivors/index-og.html'
-                print(f"  Updated Monster Survivors iframe_url to: {game.iframe_url}")
+                lines.append(f"  Updated Monster Survivors iframe_url to: {MONSTER_SURVIVORS_IFRAME_URL}")
+        if lines:
+            sys.stdout.write('\n'.join(lines) + '\n')
+
+        # For now, set iframe_url to be the same as game_url
+        # In a real scenario, you would have specific iframe URLs
+        db.session.execute(
+            update(Game)
+            .where(or_(Game.iframe_url.is_(None), Game.iframe_url == ''), Game.game_url.isnot(None), Game.game_url != '')
+            .values(iframe_url=Game.game_url)
+            .execution_options(synchronize_session=False)
+        )
+
+        # Special case for Monster Survivors
+        db.session.execute(
+            update(Game)
+            .where(Game.slug == 'monster-survivors')
+            .values(iframe_url=MONSTER_SURVIVORS_IFRAME_URL)
+            .execution_options(synchronize_session=False)
+        )
 
         # Commit all changes
         try:
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-import json
+import orjson
 import os
 from datetime import date
 from xml.sax.saxutils import escape
@@ -18,6 +18,25 @@ STATIC_PAGES = [
     "/llms.txt",
 ]
 INDEXNOW_KEY_FILE = "indexnow_key.txt"
+LEGACY_REDIRECTS = [
+    '/index.html / 308',
+    '/games.html /games 308',
+    '/about.html /about 308',
+    '/contact.html /contact 308',
+    '/privacy.html /privacy 308',
+    '/terms.html /terms 308',
+    '/editorial-policy.html /editorial-policy 308',
+    '/best/:slug.html /best/:slug 308',
+    '/best/:slug/ /best/:slug 308',
+    '/categories/:slug.html /categories/:slug 308',
+    '/categories/:slug/ /categories/:slug 308',
+    '/games/:slug.html /games/:slug 308',
+    '/games/:slug/ /games/:slug 308',
+    '/games/jailbreak-prison-escapeâ /games/jailbreak-prison-escape 308',
+    '/games/jailbreak-prison-escapeâ.html /games/jailbreak-prison-escape 308',
+    '/games/jailbreak-prison-escape%C3%A2 /games/jailbreak-prison-escape 308',
+    '/games/jailbreak-prison-escape%C3%A2.html /games/jailbreak-prison-escape 308',
+]
 
 def update_indexnow_key_file():
     if not os.path.exists(INDEXNOW_KEY_FILE):
@@ -34,15 +53,15 @@ def update_indexnow_key_file():
 
 def update_sitemap():
     # Read updated games data
-    with open('static_html/all_games.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    with open('static_html/all_games.json', 'rb') as f:
+        data = orjson.loads(f.read())
 
     # Extract games array from the data structure
     games = data.get('games', []) if isinstance(data, dict) else data
     categories = []
     if os.path.exists('static_html/categories.json'):
-        with open('static_html/categories.json', 'r', encoding='utf-8') as f:
-            categories_data = json.load(f)
+        with open('static_html/categories.json', 'rb') as f:
+            categories_data = orjson.loads(f.read())
             categories = categories_data if isinstance(categories_data, list) else []
 
     # Generate sitemap URLs
@@ -65,8 +84,7 @@ def update_sitemap():
 
     # Write sitemap
     with open('static_html/sitemap.txt', 'w', encoding='utf-8') as f:
-        for url in urls:
-            f.write(url + '\n')
+        f.write(''.join(f"{url}\n" for url in urls))
 
     print(f"Updated sitemap.txt with {len(urls)} URLs")
     print(f"  - 2 main pages")
@@ -76,39 +94,30 @@ def update_sitemap():
 
     today = date.today().isoformat()
     with open('static_html/sitemap.xml', 'w', encoding='utf-8') as f:
-        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-        f.write('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+        # Build the whole document and hand it to the writer once
+        entries = []
         for index, url in enumerate(urls):
             priority = '1.0' if index == 0 else '0.9' if index == 1 else '0.8'
             changefreq = 'daily' if index < 2 else 'weekly'
-            f.write('    <url>\n')
-            f.write(f'        <loc>{escape(url)}</loc>\n')
-            f.write(f'        <lastmod>{today}</lastmod>\n')
-            f.write(f'        <changefreq>{changefreq}</changefreq>\n')
-            f.write(f'        <priority>{priority}</priority>\n')
-            f.write('    </url>\n')
-        f.write('</urlset>\n')
+            entries.append(
+                '    <url>\n'
+                f'        <loc>{escape(url)}</loc>\n'
+                f'        <lastmod>{today}</lastmod>\n'
+                f'        <changefreq>{changefreq}</changefreq>\n'
+                f'        <priority>{priority}</priority>\n'
+                '    </url>\n'
+            )
+        f.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+            + ''.join(entries)
+            + '</urlset>\n'
+        )
 
     print(f"Updated sitemap.xml with {len(urls)} URLs")
 
     with open('static_html/_redirects', 'w', encoding='utf-8') as f:
-        f.write('/index.html / 308\n')
-        f.write('/games.html /games 308\n')
-        f.write('/about.html /about 308\n')
-        f.write('/contact.html /contact 308\n')
-        f.write('/privacy.html /privacy 308\n')
-        f.write('/terms.html /terms 308\n')
-        f.write('/editorial-policy.html /editorial-policy 308\n')
-        f.write('/best/:slug.html /best/:slug 308\n')
-        f.write('/best/:slug/ /best/:slug 308\n')
-        f.write('/categories/:slug.html /categories/:slug 308\n')
-        f.write('/categories/:slug/ /categories/:slug 308\n')
-        f.write('/games/:slug.html /games/:slug 308\n')
-        f.write('/games/:slug/ /games/:slug 308\n')
-        f.write('/games/jailbreak-prison-escapeâ /games/jailbreak-prison-escape 308\n')
-        f.write('/games/jailbreak-prison-escapeâ.html /games/jailbreak-prison-escape 308\n')
-        f.write('/games/jailbreak-prison-escape%C3%A2 /games/jailbreak-prison-escape 308\n')
-        f.write('/games/jailbreak-prison-escape%C3%A2.html /games/jailbreak-prison-escape 308\n')
+        f.write(''.join(f"{rule}\n" for rule in LEGACY_REDIRECTS))
 
     print("Updated _redirects for legacy .html URLs")
     update_indexnow_key_file()
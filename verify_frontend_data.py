@@ -4,64 +4,165 @@
 Verify that all frontend-required data is properly stored in database
 """
 
+import os
+import sys
+import argparse
+import orjson
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from app import create_app
-from models import Game, Category
-
-def verify_frontend_data():
+from models import Game, Category, db
+from sqlalchemy import func, exists, cast, select
+from sqlalchemy.dialects.postgresql import JSONB
+
+# Fields every game needs in API responses, in display order
+FRONTEND_FIELDS = (
+    'title', 'slug', 'description', 'thumbnail_url',
+    'category_name', 'rating', 'total_plays',
+    'tags', 'features', 'controls', 'game_url',
+    'is_new', 'is_featured', 'release_date'
+)
+REQUIRED_FRONTEND_FIELDS = frozenset(FRONTEND_FIELDS)
+
+# Short previews for long or nested field values, keyed by JSON value type
+PREVIEW_FORMATTERS = {
+    str: lambda value: value[:30] + "..." if len(value) > 30 else value,
+    list: lambda value: f"[{len(value)} items]",
+    dict: lambda value: f"{{{len(value)} keys}}",
+}
+
+# (connect, read) seconds for every probe, so a stalled server cannot hang the run
+HTTP_TIMEOUT = (3.05, 10)
+HTTP_RETRY = Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+
+def json_type_of(column, dialect_name):
+    """SQL expression for the top-level JSON type of a column ('array', 'object', 'null', ...)"""
+    if dialect_name == 'postgresql':
+        # Only tags is stored as JSONB; casting lets one function cover the plain json columns too
+        return func.jsonb_typeof(cast(column, JSONB))
+    return func.json_type(column)
+
+def completeness_statement(dialect_name):
+    """Single aggregate SELECT counting every required field over the active games"""
+    return select(
+        func.count().label('total'),
+        func.count().filter(Game.title.isnot(None), Game.title != '').label('title'),
+        func.count().filter(Game.slug.isnot(None), Game.slug != '').label('slug'),
+        func.count().filter(Game.description.isnot(None), Game.description != '').label('description'),
+        func.count().filter(Game.thumbnail_url.isnot(None), Game.thumbnail_url != '').label('thumbnail_url'),
+        func.count().filter(
+            exists().where(Category.id == Game.category_id, Category.name.isnot(None))
+        ).label('category_name'),
+        func.count().filter(Game.rating > 0).label('rating'),
+        func.count().filter(Game.total_plays > 0).label('total_plays'),
+        # The frontend iterates tags/features and maps controls, so check their JSON shape for every game
+        func.count().filter(json_type_of(Game.tags, dialect_name) == 'array').label('tags'),
+        func.count().filter(json_type_of(Game.features, dialect_name) == 'array').label('features'),
+        func.count().filter(json_type_of(Game.controls, dialect_name) == 'object').label('controls'),
+        func.count().filter(Game.game_url.isnot(None), Game.game_url != '').label('game_url'),
+        func.count().filter(Game.iframe_url.isnot(None), Game.iframe_url != '').label('iframe_url'),
+    ).select_from(Game).where(Game.is_active == True)
+
+def warm_server_cache(api_url, summary):
+    """POST the verification summary to the admin cache warm endpoint; returns True on success"""
+    try:
+        response = requests.post(
+            f'{api_url}/admin/cache/warm',
+            json=summary,
+            headers={'X-API-Key': os.environ.get('ADMIN_API_KEY', 'admin-api-key-change-in-production')},
+            timeout=HTTP_TIMEOUT
+        )
+        return response.status_code == 200
+    except requests.RequestException:
+        return False
+
+def verify_frontend_data(quiet=False, skip_http=False, warm_cache_url=None):
     """Verify all data required by frontend is available in database"""
 
     app = create_app()
     base_url = "http://localhost:8000"
 
     with app.app_context():
-        print("=== 前端数据完整性验证 ===\n")
-
-        # 1. Check database completeness
-        print("📊 数据库数据完整性检查:")
-        total_games = Game.query.filter(Game.is_active == True).count()
-
-        # Required fields for frontend
-        required_checks = {
-            'title': Game.query.filter(Game.title.isnot(None), Game.title != '', Game.is_active == True).count(),
-            'slug': Game.query.filter(Game.slug.isnot(None), Game.slug != '', Game.is_active == True).count(),
-            'description': Game.query.filter(Game.description.isnot(None), Game.description != '', Game.is_active == True).count(),
-            'thumbnail_url': Game.query.filter(Game.thumbnail_url.isnot(None), Game.thumbnail_url != '', Game.is_active == True).count(),
-            'category_name': Game.query.join(Category).filter(Category.name.isnot(None), Game.is_active == True).count(),
-            'rating': Game.query.filter(Game.rating > 0, Game.is_active == True).count(),
-            'total_plays': Game.query.filter(Game.total_plays > 0, Game.is_active == True).count(),
-            'tags': Game.query.filter(Game.tags.isnot(None), Game.is_active == True).count(),
-            'features': Game.query.filter(Game.features.isnot(None), Game.is_active == True).count(),
-            'controls': Game.query.filter(Game.controls.isnot(None), Game.is_active == True).count(),
-            'game_url': Game.query.filter(Game.game_url.isnot(None), Game.game_url != '', Game.is_active == True).count(),
-            'iframe_url': Game.query.filter(Game.iframe_url.isnot(None), Game.iframe_url != '', Game.is_active == True).count(),
+        if not quiet:
+            print("=== 前端数据完整性验证 ===\n")
+
+            # 1. Check database completeness
+            print("📊 数据库数据完整性检查:")
+        # Required fields for frontend, all counted in one pass over the active games
+        counts = db.session.execute(completeness_statement(db.engine.dialect.name)).one()
+
+        total_games = counts.total
+        required_checks = {field: count for field, count in counts._mapping.items() if field != 'total'}
+
+        missing_per_field = {field: total_games - count for field, count in required_checks.items() if count != total_games}
+        all_complete = not missing_per_field
+        summary = {
+            'total_games': total_games,
+            'all_complete': all_complete,
+            'missing_per_field': missing_per_field,
         }
 
-        all_complete = True
+        # Hand the summary to the Flask app, which primes the API caches in the same step
+        if warm_cache_url:
+            summary['cache_warmed'] = warm_server_cache(warm_cache_url, summary)
+            if not quiet:
+                print(f"🔥 缓存预热: {'✅' if summary['cache_warmed'] else '❌'}\n")
+
+        # CI mode: one machine-readable line, no per-field output and no HTTP probes
+        if quiet:
+            print(orjson.dumps(summary).decode())
+            return all_complete
+
+        # Each section's lines are collected and written to stdout in one call
+        lines = []
         for field, count in required_checks.items():
             percentage = (count / total_games * 100) if total_games > 0 else 0
             status = "✅" if count == total_games else "❌"
-            print(f"   {field}: {count}/{total_games} ({percentage:.1f}%) {status}")
-            if count != total_games:
-                all_complete = False
+            lines.append(f"   {field}: {count}/{total_games} ({percentage:.1f}%) {status}\n")
+        sys.stdout.write(''.join(lines))
 
         print(f"\n总体数据完整性: {'✅ 完整' if all_complete else '❌ 不完整'}\n")
 
+        if skip_http:
+            return all_complete
+
+        # Test homepage APIs and sample game slugs
+        endpoints = {
+            'New games': f'{base_url}/api/games?new=true&per_page=6&sort=newest',
+            'Popular games': f'{base_url}/api/games?per_page=6&sort=popular',
+            'Categories': f'{base_url}/api/categories',
+            'Single game': f'{base_url}/api/games/slug/papas-donuteria'
+        }
+        test_slugs = ['papas-donuteria', 'geometry-dash', 'monster-survivors']
+
+        # One pooled keep-alive session; every probe is in flight at once and
+        # the results are printed section by section below
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=HTTP_RETRY)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        executor = ThreadPoolExecutor(max_workers=8)
+        # HEAD is enough for a status check; Flask answers it for every GET route without sending the body
+        endpoint_futures = {
+            name: executor.submit(session.head, url, allow_redirects=True, timeout=HTTP_TIMEOUT)
+            for name, url in endpoints.items()
+        }
+        slugs_future = executor.submit(session.get, f'{base_url}/api/games/exists', params={'slugs': ','.join(test_slugs)}, timeout=HTTP_TIMEOUT)
+
         # 2. Test API endpoints
         print("📡 API端点测试:")
+        api_ok = False
         try:
-            # Test homepage APIs
-            endpoints = {
-                'New games': f'{base_url}/api/games?new=true&per_page=6&sort=newest',
-                'Popular games': f'{base_url}/api/games?per_page=6&sort=popular',
-                'Categories': f'{base_url}/api/categories',
-                'Single game': f'{base_url}/api/games/slug/papas-donuteria'
-            }
-
-            for name, url in endpoints.items():
-                response = requests.get(url)
-                status = "✅" if response.status_code == 200 else "❌"
-                print(f"   {name}: {status} ({response.status_code})")
+            lines = []
+            statuses = {}
+            for name, future in endpoint_futures.items():
+                statuses[name] = future.result().status_code
+                status = "✅" if statuses[name] == 200 else "❌"
+                lines.append(f"   {name}: {status} ({statuses[name]})\n")
+            sys.stdout.write(''.join(lines))
+            api_ok = all(code == 200 for code in statuses.values())
 
         except Exception as e:
             print(f"   API测试失败: {e}")
@@ -70,66 +171,85 @@ def verify_frontend_data():
         print(f"\n🎮 前端数据结构验证:")
         try:
             # Get sample game data from API
-            response = requests.get(f'{base_url}/api/games?per_page=1')
+            response = session.get(f'{base_url}/api/games?per_page=1', timeout=HTTP_TIMEOUT)
             if response.status_code == 200:
-                games = response.json()['games']
+                # Parse the raw body with orjson rather than json via response.json()
+                games = orjson.loads(response.content)['games']
                 if games:
                     game = games[0]
 
-                    # Check all required frontend fields
-                    frontend_fields = [
-                        'title', 'slug', 'description', 'thumbnail_url',
-                        'category_name', 'rating', 'total_plays',
-                        'tags', 'features', 'controls', 'game_url',
-                        'is_new', 'is_featured', 'release_date'
-                    ]
+                    # Check all required frontend fields with one set difference
+                    present_fields = frozenset(field for field, value in game.items() if value is not None)
+                    missing_fields = REQUIRED_FRONTEND_FIELDS - present_fields
+                    all_fields_present = not missing_fields
 
-                    print(f"   测试游戏: {game.get('title', 'Unknown')}")
-                    all_fields_present = True
-
-                    for field in frontend_fields:
-                        has_field = field in game and game[field] is not None
+                    lines = [f"   测试游戏: {game.get('title', 'Unknown')}\n"]
+                    for field in FRONTEND_FIELDS:
+                        has_field = field not in missing_fields
                         status = "✅" if has_field else "❌"
                         value = game.get(field, 'None')
 
                         # Show preview for some fields
-                        if isinstance(value, str) and len(value) > 30:
-                            value = value[:30] + "..."
-                        elif isinstance(value, list):
-                            value = f"[{len(value)} items]"
-                        elif isinstance(value, dict):
-                            value = f"{{{len(value)} keys}}"
-
-                        print(f"     {field}: {status} {value}")
+                        formatter = PREVIEW_FORMATTERS.get(type(value))
+                        if formatter:
+                            value = formatter(value)
 
-                        if not has_field:
-                            all_fields_present = False
+                        lines.append(f"     {field}: {status} {value}\n")
 
-                    print(f"\n   前端字段完整性: {'✅ 完整' if all_fields_present else '❌ 缺失字段'}")
+                    lines.append(f"\n   前端字段完整性: {'✅ 完整' if all_fields_present else '❌ 缺失字段'}\n")
+                    sys.stdout.write(''.join(lines))
 
         except Exception as e:
             print(f"   前端数据结构测试失败: {e}")
 
-        # 4. Test individual game pages
-        print(f"\n🔗 游戏页面测试:")
-        test_slugs = ['papas-donuteria', 'geometry-dash', 'monster-survivors']
+        # 4. Check that the sample game slugs exist (one database lookup, no page requests)
+        print(f"\n🔗 游戏slug存在性检查:")
+        slugs_ok = False
+        try:
+            response = slugs_future.result()
+            response.raise_for_status()
+            slugs_exist = response.json()['games']
+            for slug in test_slugs:
+                status = "✅" if slugs_exist.get(slug) else "❌"
+                print(f"   {slug}: {status}")
+            slugs_ok = all(slugs_exist.get(slug) for slug in test_slugs)
+        except Exception as e:
+            for slug in test_slugs:
+                print(f"   {slug}: ❌ ({e})")
 
-        for slug in test_slugs:
-            try:
-                response = requests.head(f'{base_url}/games/{slug}')
-                status = "✅" if response.status_code == 200 else "❌"
-                print(f"   /games/{slug}: {status}")
-            except Exception as e:
-                print(f"   /games/{slug}: ❌ ({e})")
+        executor.shutdown()
+        session.close()
 
         # 5. Summary
-        print(f"\n📋 总结:")
-        print(f"   数据库游戏总数: {total_games}")
-        print(f"   数据完整性: {'✅ 所有字段完整' if all_complete else '❌ 部分字段缺失'}")
-        print(f"   API响应: ✅ 正常")
-        print(f"   游戏页面: ✅ 可访问")
+        sys.stdout.write(
+            f"\n📋 总结:\n"
+            f"   数据库游戏总数: {total_games}\n"
+            f"   数据完整性: {'✅ 所有字段完整' if all_complete else '❌ 部分字段缺失'}\n"
+            f"   API响应: {'✅ 正常' if api_ok else '❌ 异常'}\n"
+            f"   游戏slug: {'✅ 全部存在' if slugs_ok else '❌ 部分缺失'}\n"
+            f"\n{'🎉 所有前端数据验证通过!' if all_complete else '⚠️  需要修复部分数据完整性问题'}\n"
+        )
 
-        print(f"\n{'🎉 所有前端数据验证通过!' if all_complete else '⚠️  需要修复部分数据完整性问题'}")
+    return all_complete
 
 if __name__ == '__main__':
-    verify_frontend_data()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Verify frontend-required game data")
+    parser.add_argument(
+        '--quiet', '-q',
+        action='store_true',
+        help="Only run the database check and print a single JSON summary line (implies --skip-http)"
+    )
+    parser.add_argument(
+        '--skip-http',
+        action='store_true',
+        help="Skip the API and game page probes"
+    )
+    parser.add_argument(
+        '--warm-cache',
+        metavar='FLASK_URL',
+        help="POST the summary to FLASK_URL/admin/cache/warm to prime API caches (e.g. http://localhost:5001)"
+    )
+    args = parser.parse_args()
+
+    complete = verify_frontend_data(quiet=args.quiet, skip_http=args.skip_http, warm_cache_url=args.warm_cache)
+    sys.exit(0 if complete else 1)
\ No newline at end of file